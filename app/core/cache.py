@@ -0,0 +1,126 @@
+from __future__ import annotations
+import threading
+import time
+import uuid
+from collections import OrderedDict
+from typing import Any, Callable, Optional, Protocol
+
+from app.core.config import settings
+from app.core.responses import dumps, loads
+
+
+class Cache(Protocol):
+    def get(self, key: str) -> Optional[str]: ...
+
+    def set(self, key: str, value: str, ttl: Optional[int] = None) -> None: ...
+
+    def delete(self, key: str) -> None: ...
+
+
+class MemoryCache:
+    def __init__(self, max_entries: int) -> None:
+        self._data: OrderedDict[str, tuple[Optional[float], str]] = OrderedDict()
+        self._max_entries = max_entries
+        self._lock = threading.Lock()
+
+    def get(self, key: str) -> Optional[str]:
+        with self._lock:
+            entry = self._data.get(key)
+            if entry is None:
+                return None
+            expires_at, value = entry
+            if expires_at is not None and expires_at <= time.monotonic():
+                del self._data[key]
+                return None
+            self._data.move_to_end(key)
+            return value
+
+    def set(self, key: str, value: str, ttl: Optional[int] = None) -> None:
+        expires_at = time.monotonic() + ttl if ttl else None
+        with self._lock:
+            self._data[key] = (expires_at, value)
+            self._data.move_to_end(key)
+            while len(self._data) > self._max_entries:
+                self._data.popitem(last=False)
+
+    def delete(self, key: str) -> None:
+        with self._lock:
+            self._data.pop(key, None)
+
+
+class RedisCache:
+    def __init__(self, url: str) -> None:
+        import redis
+
+        self._client = redis.Redis.from_url(url, decode_responses=True)
+
+    def get(self, key: str) -> Optional[str]:
+        return self._client.get(key)
+
+    def set(self, key: str, value: str, ttl: Optional[int] = None) -> None:
+        self._client.set(key, value, ex=ttl or None)
+
+    def delete(self, key: str) -> None:
+        self._client.delete(key)
+
+
+def _build_cache() -> Cache:
+    if settings.redis_url:
+        return RedisCache(settings.redis_url)
+    return MemoryCache(settings.cache_max_entries)
+
+
+cache: Cache = _build_cache()
+
+
+# Catalog read-through. Keys embed generation tokens that writes replace rather than deleting
+# keys: a reader that loaded before a write stores under the old generation, which nobody reads
+# again, so a racing reader can never resurrect stale data. Orphans age out by TTL or LRU.
+# With MemoryCache the tokens live in one process: other workers keep their pages until the TTL.
+GENERATION_TTL = 24 * 3600
+
+
+def _gen_key(*parts: Any) -> str:
+    return "gen:" + ":".join(map(str, parts))
+
+
+def _generation(gen_key: str) -> str:
+    gen = cache.get(gen_key)
+    if gen is None:
+        gen = uuid.uuid4().hex[:12]
+        cache.set(gen_key, gen, GENERATION_TTL)
+    return gen
+
+
+def _bump(gen_key: str) -> None:
+    cache.set(gen_key, uuid.uuid4().hex[:12], GENERATION_TTL)
+
+
+def read_through(namespace: str, kind: str, parts: tuple, loader: Callable[[], Any]) -> Any:
+    gens = [_generation(_gen_key(namespace, kind))]
+    if kind == "item":
+        gens.append(_generation(_gen_key(namespace, kind, *parts)))
+    key = ":".join(["catalog", namespace, kind, *gens, *map(str, parts)])
+    cached = cache.get(key)
+    if cached is not None:
+        return loads(cached)
+    value = loader()
+    if value is not None:
+        cache.set(key, dumps(value).decode(), settings.catalog_cache_ttl_seconds)
+    return value
+
+
+def invalidate_item(namespace: str, item_id: int) -> None:
+    _bump(_gen_key(namespace, "item", item_id))
+
+
+def invalidate_lists(*namespaces: str) -> None:
+    for namespace in namespaces:
+        _bump(_gen_key(namespace, "list"))
+
+
+def invalidate_namespace(*namespaces: str) -> None:
+    # For cascaded deletes, where the affected item ids are not known.
+    for namespace in namespaces:
+        _bump(_gen_key(namespace, "item"))
+        _bump(_gen_key(namespace, "list"))
@@ -1,5 +1,8 @@
+from typing import Literal
+
 from pydantic_settings import BaseSettings
 from pydantic import Field
+from sqlalchemy.engine import URL
 
 
 class Settings(BaseSettings):
@@ -7,21 +10,68 @@ class Settings(BaseSettings):
     app_env: str = Field(default="development", alias="APP_ENV")
     app_debug: bool = Field(default=True, alias="APP_DEBUG")
 
-    db_user: str = Field(alias="DB_USER")
-    db_password: str = Field(alias="DB_PASSWORD")
-    db_host: str = Field(alias="DB_HOST")
-    db_port: int = Field(alias="DB_PORT")
-    db_name: str = Field(alias="DB_NAME")
+    # DATABASE_URL / ASYNC_DATABASE_URL win over the DB_* parts when set.
+    db_url: str | None = Field(default=None, alias="DATABASE_URL")
+    db_async_url: str | None = Field(default=None, alias="ASYNC_DATABASE_URL")
+    db_driver: str = Field(default="postgresql+psycopg2", alias="DB_DRIVER")
+    db_async_driver: str = Field(default="postgresql+asyncpg", alias="DB_ASYNC_DRIVER")
+    db_user: str | None = Field(default=None, alias="DB_USER")
+    db_password: str | None = Field(default=None, alias="DB_PASSWORD")
+    db_host: str | None = Field(default=None, alias="DB_HOST")
+    db_port: int | None = Field(default=None, alias="DB_PORT")
+    db_name: str | None = Field(default=None, alias="DB_NAME")
+    db_async: bool = Field(default=False, alias="DB_ASYNC")
+
+    db_pool_size: int = Field(default=5, alias="DB_POOL_SIZE")
+    db_max_overflow: int = Field(default=10, alias="DB_MAX_OVERFLOW")
+    db_pool_timeout: float = Field(default=30.0, alias="DB_POOL_TIMEOUT")
+    db_pool_recycle: int = Field(default=3600, alias="DB_POOL_RECYCLE")
+    # always: ping on every checkout; idle: ping only connections idle longer than
+    # DB_POOL_PING_IDLE_SECONDS; never: rely on pool_recycle and disconnect invalidation.
+    db_pool_pre_ping: Literal["always", "idle", "never"] = Field(default="idle", alias="DB_POOL_PRE_PING")
+    db_pool_ping_idle_seconds: float = Field(default=30.0, alias="DB_POOL_PING_IDLE_SECONDS")
+
+    db_slow_query_ms: float = Field(default=200.0, alias="DB_SLOW_QUERY_MS")
+    # Log a possible N+1 when one statement runs at least this many times in a single request.
+    db_n_plus_one_threshold: int = Field(default=10, alias="DB_N_PLUS_ONE_THRESHOLD")
+    # Raise on lazy relationship loads instead of emitting them; meant for tests and CI.
+    db_strict_loading: bool = Field(default=False, alias="DB_STRICT_LOADING")
 
     jwt_secret: str = Field(alias="JWT_SECRET")
     jwt_algorithm: str = Field(default="HS256", alias="JWT_ALGORITHM")
     jwt_access_token_expire_minutes: int = Field(default=60, alias="JWT_ACCESS_TOKEN_EXPIRE_MINUTES")
+    # Serve authenticated requests from the token's claims instead of loading the user row.
+    jwt_stateless: bool = Field(default=False, alias="JWT_STATELESS")
+
+    password_hash_rounds: int = Field(default=29000, alias="PASSWORD_HASH_ROUNDS")
+    password_hash_workers: int = Field(default=2, alias="PASSWORD_HASH_WORKERS")
+    password_hash_queue_size: int = Field(default=32, alias="PASSWORD_HASH_QUEUE_SIZE")
 
     redis_url: str | None = Field(default=None, alias="REDIS_URL")
+    cache_max_entries: int = Field(default=10000, alias="CACHE_MAX_ENTRIES")
+    catalog_cache_ttl_seconds: int = Field(default=300, alias="CATALOG_CACHE_TTL_SECONDS")
+    seat_map_cache_ttl_seconds: int = Field(default=5, alias="SEAT_MAP_CACHE_TTL_SECONDS")
+
+    seat_hold_ttl_seconds: int = Field(default=300, alias="SEAT_HOLD_TTL_SECONDS")
+    seat_hold_sweep_interval_seconds: float = Field(default=5.0, alias="SEAT_HOLD_SWEEP_INTERVAL_SECONDS")
+
+    show_cleaning_buffer_minutes: int = Field(default=15, alias="SHOW_CLEANING_BUFFER_MINUTES")
+
+    # Shared directory where each worker process writes its metrics; needed with more than one worker.
+    metrics_dir: str | None = Field(default=None, alias="METRICS_DIR")
+    metrics_flush_interval_seconds: float = Field(default=1.0, alias="METRICS_FLUSH_INTERVAL_SECONDS")
+
+    def _build_url(self, driver: str) -> str:
+        url = URL.create(driver, self.db_user, self.db_password, self.db_host, self.db_port, self.db_name)
+        return url.render_as_string(hide_password=False)
 
     @property
     def sync_database_url(self) -> str:
-        return f"postgresql://{self.db_user}:{self.db_password}@{self.db_host}:{self.db_port}/{self.db_name}"
+        return self.db_url or self._build_url(self.db_driver)
+
+    @property
+    def async_database_url(self) -> str:
+        return self.db_async_url or self._build_url(self.db_async_driver)
 
     model_config = {
         "env_file": ".env",
@@ -30,5 +80,3 @@ class Settings(BaseSettings):
 
 
 settings = Settings()  # type: ignore[arg-type]
-
-
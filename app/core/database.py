@@ -1,16 +1,37 @@
+from typing import Any, Callable, TypeVar, Union
+
+from fastapi.concurrency import run_in_threadpool
 from sqlalchemy import create_engine
-from sqlalchemy.orm import sessionmaker, DeclarativeBase
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
+from sqlalchemy.orm import sessionmaker, DeclarativeBase, Session
 
 from app.core.config import settings
+from app.core.profiler import profiled
+from app.core.pool import InstrumentedAsyncQueuePool, InstrumentedQueuePool, engine_options, install_idle_ping
+from app.core.query_stats import install_query_stats, install_strict_loading
+
+T = TypeVar("T")
+DbSession = Union[Session, AsyncSession]
 
 
 class Base(DeclarativeBase):
     pass
 
 
-engine = create_engine(settings.sync_database_url, pool_pre_ping=True, pool_recycle=3600)
+engine = create_engine(settings.sync_database_url, **engine_options(InstrumentedQueuePool))
+install_idle_ping(engine)
+install_query_stats(engine)
 SessionLocal = sessionmaker(bind=engine, autoflush=False, autocommit=False)
 
+async_engine = create_async_engine(settings.async_database_url, **engine_options(InstrumentedAsyncQueuePool)) if settings.db_async else None
+if async_engine is not None:
+    install_idle_ping(async_engine.sync_engine)
+    install_query_stats(async_engine.sync_engine)
+AsyncSessionLocal = async_sessionmaker(bind=async_engine, autoflush=False, expire_on_commit=False) if settings.db_async else None
+
+if settings.db_strict_loading:
+    install_strict_loading()
+
 
 def get_db():
     db = SessionLocal()
@@ -18,3 +39,28 @@ def get_db():
         yield db
     finally:
         db.close()
+
+
+async def get_async_db():
+    async with AsyncSessionLocal() as db:
+        yield db
+
+
+# Routers depend on get_session and call services through run_db, so DB_ASYNC switches stacks
+# without touching them: the sync stack parks each call on the threadpool, the async stack runs
+# the same service code on the event loop via AsyncSession.run_sync.
+get_session = get_async_db if settings.db_async else get_db
+
+
+async def run_db(db: DbSession, fn: Callable[..., T], *args: Any, **kwargs: Any) -> T:
+    fn = profiled(fn)
+    if isinstance(db, AsyncSession):
+        return await db.run_sync(fn, *args, **kwargs)
+    return await run_in_threadpool(fn, db, *args, **kwargs)
+
+
+async def close_db(db: DbSession) -> None:
+    if isinstance(db, AsyncSession):
+        await db.close()
+    else:
+        await run_in_threadpool(db.close)
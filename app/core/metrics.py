@@ -0,0 +1,239 @@
+from __future__ import annotations
+import asyncio
+import json
+import logging
+import os
+import threading
+import time
+from bisect import bisect_left
+from pathlib import Path
+from typing import Any, Iterable
+
+from fastapi.concurrency import run_in_threadpool
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+from app.core.config import settings
+from app.core.query_stats import current_query_stats, route_template
+
+logger = logging.getLogger(__name__)
+
+CONTENT_TYPE = "text/plain; version=0.0.4; charset=utf-8"
+
+# Upper bounds in seconds; the last bucket counts everything slower.
+LATENCY_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+
+
+class _Metric:
+    kind = ""
+
+    def __init__(self, name: str, help: str, labelnames: tuple[str, ...] = ()) -> None:
+        self.name = name
+        self.help = help
+        self.labelnames = labelnames
+        self._values: dict[tuple[str, ...], Any] = {}
+        self._lock = threading.Lock()
+        _registry.append(self)
+
+    def samples(self) -> list[list[Any]]:
+        with self._lock:
+            return [[list(labels), value.copy() if isinstance(value, list) else value] for labels, value in self._values.items()]
+
+    def restore(self, samples: Iterable[list[Any]]) -> None:
+        with self._lock:
+            for labels, value in samples:
+                self._values[tuple(labels)] = value
+
+
+class Counter(_Metric):
+    kind = "counter"
+
+    def inc(self, *labels: str, amount: float = 1) -> None:
+        with self._lock:
+            self._values[labels] = self._values.get(labels, 0) + amount
+
+
+class Gauge(_Metric):
+    kind = "gauge"
+
+    def add(self, amount: float, *labels: str) -> None:
+        with self._lock:
+            self._values[labels] = self._values.get(labels, 0) + amount
+
+
+class Histogram(_Metric):
+    kind = "histogram"
+
+    def __init__(self, name: str, help: str, labelnames: tuple[str, ...] = (), buckets: tuple[float, ...] = LATENCY_BUCKETS) -> None:
+        super().__init__(name, help, labelnames)
+        self.buckets = buckets
+
+    def observe(self, value: float, *labels: str) -> None:
+        # Per-bucket counts followed by the running sum; made cumulative only when rendered.
+        with self._lock:
+            counts = self._values.get(labels)
+            if counts is None:
+                counts = self._values[labels] = [0] * (len(self.buckets) + 1) + [0.0]
+            counts[bisect_left(self.buckets, value)] += 1
+            counts[-1] += value
+
+
+_registry: list[_Metric] = []
+
+requests_total = Counter("http_requests_total", "HTTP requests by route and status.", ("method", "route", "status"))
+request_seconds = Histogram("http_request_duration_seconds", "Time to handle a request, including streaming the body.", ("method", "route"))
+request_db_seconds = Histogram("http_request_db_seconds", "Time spent in the database per request.", ("method", "route"))
+requests_in_flight = Gauge("http_requests_in_flight", "Requests currently being handled.")
+bookings_created = Counter("bookings_created_total", "Bookings committed.", ("source",))
+seat_conflicts = Counter("seat_conflicts_total", "Booking and hold attempts rejected with 409 because a seat was taken.")
+logins = Counter("logins_total", "Login attempts by outcome.", ("result",))
+password_hash_seconds = Histogram(
+    "password_hash_seconds", "Time spent hashing or verifying a password on the hashing pool.", ("operation",),
+    buckets=(0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5),
+)
+
+
+class MetricsMiddleware:
+    def __init__(self, app: ASGIApp) -> None:
+        self.app = app
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        status_code = 500
+
+        async def send_with_status(message: Message) -> None:
+            nonlocal status_code
+            if message["type"] == "http.response.start":
+                status_code = message["status"]
+            await send(message)
+
+        started = time.perf_counter()
+        requests_in_flight.add(1)
+        try:
+            await self.app(scope, receive, send_with_status)
+        finally:
+            requests_in_flight.add(-1)
+            elapsed = time.perf_counter() - started
+            method, route = scope["method"], route_template(scope) or "unmatched"
+            requests_total.inc(method, route, str(status_code))
+            request_seconds.observe(elapsed, method, route)
+            stats = current_query_stats()
+            if stats is not None:
+                request_db_seconds.observe(stats.seconds, method, route)
+
+
+# With several uvicorn workers every process writes its samples to METRICS_DIR/<pid>.json and
+# /metrics sums the files, so a scrape that lands on any one worker sees the whole server.
+def _snapshot() -> dict[str, list[list[Any]]]:
+    return {metric.name: metric.samples() for metric in _registry}
+
+
+def _snapshot_path(pid: int) -> Path:
+    return Path(settings.metrics_dir) / f"{pid}.json"
+
+
+def _flush() -> None:
+    path = _snapshot_path(os.getpid())
+    tmp = path.with_suffix(".tmp")
+    tmp.write_text(json.dumps(_snapshot()))
+    os.replace(tmp, path)
+
+
+def _restore() -> None:
+    # A worker that reuses the pid of an earlier one carries its counters on instead of resetting them.
+    path = _snapshot_path(os.getpid())
+    if not path.exists():
+        return
+    snapshot = json.loads(path.read_text())
+    for metric in _registry:
+        if metric.kind != "gauge":
+            metric.restore(snapshot.get(metric.name, []))
+
+
+def _pid_alive(pid: int) -> bool:
+    try:
+        os.kill(pid, 0)
+    except ProcessLookupError:
+        return False
+    except PermissionError:
+        pass
+    return True
+
+
+def _worker_snapshots() -> list[dict[str, list[list[Any]]]]:
+    snapshots = [_snapshot()]
+    if not settings.metrics_dir:
+        return snapshots
+    gauges = {metric.name for metric in _registry if metric.kind == "gauge"}
+    for path in Path(settings.metrics_dir).glob("*.json"):
+        if not path.stem.isdigit() or int(path.stem) == os.getpid():
+            continue
+        pid = int(path.stem)
+        try:
+            snapshot = json.loads(path.read_text())
+        except (OSError, ValueError):
+            continue
+        if not _pid_alive(pid):
+            # Counters of a dead worker still count towards the totals; its gauges do not.
+            snapshot = {name: samples for name, samples in snapshot.items() if name not in gauges}
+        snapshots.append(snapshot)
+    return snapshots
+
+
+def _merge(metric: _Metric, snapshots: list[dict[str, list[list[Any]]]]) -> dict[tuple[str, ...], Any]:
+    merged: dict[tuple[str, ...], Any] = {}
+    for snapshot in snapshots:
+        for labels, value in snapshot.get(metric.name, []):
+            key = tuple(labels)
+            if isinstance(value, list):
+                total = merged.setdefault(key, [0] * len(value))
+                for i, v in enumerate(value):
+                    total[i] += v
+            else:
+                merged[key] = merged.get(key, 0) + value
+    return merged
+
+
+def _escape(value: str) -> str:
+    return value.replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+
+def _labels(names: Iterable[str], values: Iterable[str]) -> str:
+    pairs = ",".join(f'{name}="{_escape(value)}"' for name, value in zip(names, values))
+    return f"{{{pairs}}}" if pairs else ""
+
+
+def render_metrics() -> str:
+    snapshots = _worker_snapshots()
+    lines = []
+    for metric in _registry:
+        lines.append(f"# HELP {metric.name} {metric.help}")
+        lines.append(f"# TYPE {metric.name} {metric.kind}")
+        for labels, value in sorted(_merge(metric, snapshots).items()):
+            if not isinstance(metric, Histogram):
+                lines.append(f"{metric.name}{_labels(metric.labelnames, labels)} {value}")
+                continue
+            cumulative = 0
+            for bound, count in zip((*map(str, metric.buckets), "+Inf"), value[:-1]):
+                cumulative += count
+                lines.append(f"{metric.name}_bucket{_labels((*metric.labelnames, 'le'), (*labels, bound))} {cumulative}")
+            lines.append(f"{metric.name}_sum{_labels(metric.labelnames, labels)} {value[-1]}")
+            lines.append(f"{metric.name}_count{_labels(metric.labelnames, labels)} {cumulative}")
+    return "\n".join(lines) + "\n"
+
+
+async def run_metrics_flusher() -> None:
+    if not settings.metrics_dir:
+        return
+    await run_in_threadpool(_restore)
+    try:
+        while True:
+            await asyncio.sleep(settings.metrics_flush_interval_seconds)
+            try:
+                await run_in_threadpool(_flush)
+            except OSError:
+                logger.exception("Writing metrics to %s failed", settings.metrics_dir)
+    finally:
+        _flush()
@@ -0,0 +1,73 @@
+from __future__ import annotations
+import base64
+import json
+from datetime import datetime
+from typing import Any, Optional, Sequence
+
+from fastapi import HTTPException, Response, status
+from pydantic import BaseModel
+from sqlalchemy import tuple_
+from sqlalchemy.orm import InstrumentedAttribute, Query
+
+from app.core.responses import FastJSONResponse
+
+DEFAULT_LIMIT = 100
+MAX_LIMIT = 500
+
+
+def _encode(value: Any) -> Any:
+    return value.isoformat() if isinstance(value, datetime) else value
+
+
+def encode_cursor(values: Sequence[Any]) -> str:
+    raw = json.dumps([_encode(v) for v in values], separators=(",", ":")).encode()
+    return base64.urlsafe_b64encode(raw).decode().rstrip("=")
+
+
+def decode_cursor(cursor: str, keys: Sequence[InstrumentedAttribute]) -> list[Any]:
+    try:
+        values = json.loads(base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4)))
+        if len(values) != len(keys):
+            raise ValueError
+        return [datetime.fromisoformat(v) if key.type.python_type is datetime else key.type.python_type(v) for key, v in zip(keys, values)]
+    except (ValueError, TypeError):
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="Invalid cursor")
+
+
+def project(query: Query, entity: type, schema: type[BaseModel]) -> Query:
+    # Select only the columns the output schema exposes, so a page comes back as plain rows
+    # (row._asdict() is the response item) instead of hydrated ORM entities.
+    return query.with_entities(*(getattr(entity, name) for name in schema.model_fields))
+
+
+def paginate(
+    query: Query,
+    keys: Sequence[InstrumentedAttribute],
+    limit: int,
+    cursor: Optional[str],
+    descending: bool = False,
+) -> tuple[list, Optional[str]]:
+    # Keyset pagination: seek past the last row's sort key instead of OFFSET, so every page
+    # costs one index range scan however deep the client has paged.
+    if cursor:
+        after = decode_cursor(cursor, keys)
+        key, bound = (keys[0], after[0]) if len(keys) == 1 else (tuple_(*keys), tuple_(*after))
+        query = query.filter(key < bound if descending else key > bound)
+    rows = query.order_by(*(k.desc() for k in keys) if descending else keys).limit(limit + 1).all()
+    if len(rows) <= limit:
+        return rows, None
+    rows = rows[:limit]
+    return rows, encode_cursor([getattr(rows[-1], key.key) for key in keys])
+
+
+def set_next_cursor(response: Response, next_cursor: Optional[str]) -> None:
+    if next_cursor:
+        response.headers["X-Next-Cursor"] = next_cursor
+
+
+def page_response(items: list, next_cursor: Optional[str]) -> FastJSONResponse:
+    # Items are already response-shaped dicts; the route's response_model still documents them, but a
+    # returned Response skips validating every item against it again.
+    response = FastJSONResponse(items)
+    set_next_cursor(response, next_cursor)
+    return response
@@ -0,0 +1,113 @@
+from __future__ import annotations
+import threading
+import time
+from bisect import bisect_left
+from typing import Any
+
+from sqlalchemy import event, exc
+from sqlalchemy.engine import Engine
+from sqlalchemy.pool import AsyncAdaptedQueuePool, Pool, QueuePool
+
+from app.core.config import settings
+
+# Upper bounds in seconds; the last bucket counts everything slower.
+CHECKOUT_BUCKETS = (0.001, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0)
+
+
+class PoolStats:
+    def __init__(self) -> None:
+        self._lock = threading.Lock()
+        self.checkouts = 0
+        self.timeouts = 0
+        self.wait_total = 0.0
+        self.wait_max = 0.0
+        self.buckets = [0] * (len(CHECKOUT_BUCKETS) + 1)
+
+    def observe(self, seconds: float, timed_out: bool = False) -> None:
+        with self._lock:
+            if timed_out:
+                self.timeouts += 1
+            else:
+                self.checkouts += 1
+            self.wait_total += seconds
+            self.wait_max = max(self.wait_max, seconds)
+            self.buckets[bisect_left(CHECKOUT_BUCKETS, seconds)] += 1
+
+    def snapshot(self, pool: Pool) -> dict[str, Any]:
+        with self._lock:
+            histogram = {str(bound): count for bound, count in zip(CHECKOUT_BUCKETS, self.buckets)}
+            histogram["+Inf"] = self.buckets[-1]
+            attempts = self.checkouts + self.timeouts
+            stats = {
+                "checkouts": self.checkouts,
+                "timeouts": self.timeouts,
+                "wait_seconds_total": round(self.wait_total, 6),
+                "wait_seconds_avg": round(self.wait_total / attempts, 6) if attempts else 0.0,
+                "wait_seconds_max": round(self.wait_max, 6),
+                "checkout_latency_histogram": histogram,
+            }
+        if isinstance(pool, QueuePool):
+            stats.update(size=pool.size(), checked_in=pool.checkedin(), checked_out=pool.checkedout(), overflow=pool.overflow())
+        return stats
+
+
+class _InstrumentedPoolMixin:
+    # Times Pool._do_get: queue wait plus connecting when the pool grows.
+    def __init__(self, *args: Any, **kwargs: Any) -> None:
+        super().__init__(*args, **kwargs)
+        self.stats = PoolStats()
+
+    def _do_get(self):
+        started = time.perf_counter()
+        try:
+            conn = super()._do_get()
+        except exc.TimeoutError:
+            self.stats.observe(time.perf_counter() - started, timed_out=True)
+            raise
+        self.stats.observe(time.perf_counter() - started)
+        return conn
+
+
+class InstrumentedQueuePool(_InstrumentedPoolMixin, QueuePool):
+    pass
+
+
+class InstrumentedAsyncQueuePool(_InstrumentedPoolMixin, AsyncAdaptedQueuePool):
+    pass
+
+
+def engine_options(poolclass: type[Pool]) -> dict[str, Any]:
+    return {
+        "poolclass": poolclass,
+        "pool_size": settings.db_pool_size,
+        "max_overflow": settings.db_max_overflow,
+        "pool_timeout": settings.db_pool_timeout,
+        "pool_recycle": settings.db_pool_recycle,
+        "pool_pre_ping": settings.db_pool_pre_ping == "always",
+    }
+
+
+def install_idle_ping(engine: Engine) -> None:
+    if settings.db_pool_pre_ping != "idle":
+        return
+
+    @event.listens_for(engine.pool, "checkin")
+    def _stamp(dbapi_connection, record) -> None:
+        record.info["checked_in_at"] = time.monotonic()
+
+    @event.listens_for(engine.pool, "checkout")
+    def _ping_if_idle(dbapi_connection, record, proxy) -> None:
+        checked_in_at = record.info.get("checked_in_at")
+        if checked_in_at is None or time.monotonic() - checked_in_at < settings.db_pool_ping_idle_seconds:
+            return
+        try:
+            engine.dialect.do_ping(dbapi_connection)
+        except Exception as e:
+            # The pool discards this connection and retries the checkout with a fresh one.
+            raise exc.DisconnectionError() from e
+
+
+def pool_stats(engine: Engine) -> dict[str, Any]:
+    pool = engine.pool
+    stats = getattr(pool, "stats", None)
+    return stats.snapshot(pool) if stats is not None else {"status": pool.status()}
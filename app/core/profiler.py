@@ -0,0 +1,301 @@
+from __future__ import annotations
+import cProfile
+import os
+import pstats
+import sys
+import threading
+from collections import Counter
+from contextvars import ContextVar
+from datetime import datetime
+from functools import wraps
+from types import CodeType, FrameType
+from typing import Any, Callable, Literal, Optional, TypeVar
+
+from starlette.types import ASGIApp, Receive, Scope, Send
+
+T = TypeVar("T")
+Mode = Literal["sampling", "deterministic"]
+
+# Requests to the profiling endpoints themselves are never profiled.
+EXCLUDED_PREFIX = "/api/admin/profile"
+
+# Before 3.12 cProfile hooks only the thread that enables it, so deterministic mode turns a profile on
+# around each step of a request and each run_db call. From 3.12 it sits on sys.monitoring, which is
+# process-wide and takes one profiler at a time: the session then runs a single profile from start until
+# it ends, and that profile records every thread of the worker, other requests included.
+PROCESS_WIDE_CPROFILE = sys.version_info >= (3, 12)
+
+
+def _label(code: CodeType) -> str:
+    return f"{code.co_name} ({os.path.basename(code.co_filename)}:{code.co_firstlineno})"
+
+
+def _stack(frame: Optional[FrameType], marker: FrameType) -> Optional[tuple[str, ...]]:
+    # Root-first stack from marker down to the running frame, or None when the thread is not
+    # currently inside marker (the event loop is running some other request).
+    labels = []
+    while frame is not None:
+        labels.append(_label(frame.f_code))
+        if frame is marker:
+            return tuple(reversed(labels))
+        frame = frame.f_back
+    return None
+
+
+class _ProfiledRequest:
+    def __init__(self, session: "ProfileSession") -> None:
+        self.session = session
+        self.loop_thread = threading.get_ident()
+        # (thread id, frame) pairs: the request's code is running on that thread while frame is on its stack.
+        self.markers: list[tuple[int, FrameType]] = []
+
+    def run(self, fn: Callable[..., T], *args: Any, **kwargs: Any) -> T:
+        session = self.session
+        if session.mode == "deterministic":
+            # The session's process-wide profile, or on the event loop thread (AsyncSession.run_sync) the
+            # request's own, is already on.
+            if PROCESS_WIDE_CPROFILE or threading.get_ident() == self.loop_thread:
+                return fn(*args, **kwargs)
+            profile = cProfile.Profile()
+            profile.enable()
+            try:
+                return fn(*args, **kwargs)
+            finally:
+                profile.disable()
+                session.add_profile(profile)
+        marker = (threading.get_ident(), sys._getframe())
+        session.mark(self, marker)
+        try:
+            return fn(*args, **kwargs)
+        finally:
+            session.unmark(self, marker)
+
+
+class ProfileSession:
+    def __init__(self, mode: Mode, requests: int, path: Optional[str], interval: float) -> None:
+        self.mode = mode
+        self.requests = requests
+        self.path = path
+        self.interval = interval
+        self.started_at = datetime.utcnow()
+        self.remaining = requests
+        self.in_flight = 0
+        self.captured = 0
+        self.samples = 0
+        self.stacks: Counter[tuple[str, ...]] = Counter()
+        self.stats: Optional[pstats.Stats] = None
+        self._active: list[_ProfiledRequest] = []
+        self._lock = threading.Lock()
+        self._stopped = threading.Event()
+        self._profile: Optional[cProfile.Profile] = None
+        if mode == "sampling":
+            threading.Thread(target=self._sample, name="profiler", daemon=True).start()
+        elif PROCESS_WIDE_CPROFILE:
+            # Raises ValueError when some other profiler is already active in the process.
+            profile = cProfile.Profile()
+            profile.enable()
+            self._profile = profile
+
+    @property
+    def finished(self) -> bool:
+        return self.remaining == 0 and self.in_flight == 0
+
+    def claim(self, path: str) -> Optional[_ProfiledRequest]:
+        if path.startswith(EXCLUDED_PREFIX) or (self.path and not path.startswith(self.path)):
+            return None
+        with self._lock:
+            if self.remaining == 0:
+                return None
+            self.remaining -= 1
+            self.in_flight += 1
+            request = _ProfiledRequest(self)
+            self._active.append(request)
+            return request
+
+    def release(self, request: _ProfiledRequest) -> None:
+        with self._lock:
+            self._active.remove(request)
+            self.in_flight -= 1
+            self.captured += 1
+            if self.finished:
+                self._stop()
+
+    def stop(self) -> None:
+        with self._lock:
+            self._stop()
+
+    def _stop(self) -> None:
+        self._stopped.set()
+        profile, self._profile = self._profile, None
+        if profile is not None:
+            profile.disable()
+            self._add_profile(profile)
+
+    def mark(self, request: _ProfiledRequest, marker: tuple[int, FrameType]) -> None:
+        with self._lock:
+            request.markers.append(marker)
+
+    def unmark(self, request: _ProfiledRequest, marker: tuple[int, FrameType]) -> None:
+        with self._lock:
+            request.markers.remove(marker)
+
+    def add_profile(self, profile: cProfile.Profile) -> None:
+        with self._lock:
+            self._add_profile(profile)
+
+    def _add_profile(self, profile: cProfile.Profile) -> None:
+        if self.stats is None:
+            self.stats = pstats.Stats(profile)
+        else:
+            self.stats.add(profile)
+
+    def _sample(self) -> None:
+        while not self._stopped.wait(self.interval):
+            with self._lock:
+                markers = [list(request.markers) for request in self._active]
+            if not any(markers):
+                continue
+            frames = sys._current_frames()
+            stacks = []
+            for request_markers in markers:
+                seen = set()
+                # The request's own frame is marked first, so a thread inside both it and a run_db
+                # call is counted once, with the longer stack.
+                for thread_id, marker in request_markers:
+                    if thread_id in seen:
+                        continue
+                    stack = _stack(frames.get(thread_id), marker)
+                    if stack:
+                        seen.add(thread_id)
+                        stacks.append(stack)
+            del frames
+            with self._lock:
+                self.stacks.update(stacks)
+                self.samples += len(stacks)
+
+    def hot_functions(self, sort: Literal["self", "total"], limit: int) -> list[dict[str, Any]]:
+        with self._lock:
+            if self.mode == "deterministic":
+                rows = [
+                    {"function": f"{name} ({os.path.basename(filename)}:{line})", "calls": calls, "self_seconds": tottime, "total_seconds": cumtime}
+                    for (filename, line, name), (_, calls, tottime, cumtime, _) in (self.stats.stats.items() if self.stats else ())
+                ]
+            else:
+                own: Counter[str] = Counter()
+                total: Counter[str] = Counter()
+                for stack, count in self.stacks.items():
+                    own[stack[-1]] += count
+                    for label in set(stack):
+                        total[label] += count
+                rows = [
+                    {"function": label, "calls": None, "self_seconds": own[label] * self.interval, "total_seconds": count * self.interval}
+                    for label, count in total.items()
+                ]
+        rows.sort(key=lambda row: row[f"{sort}_seconds"], reverse=True)
+        return rows[:limit]
+
+    def collapsed(self) -> str:
+        # One "root;...;leaf count" line per distinct stack: the input flamegraph.pl and speedscope read.
+        with self._lock:
+            return "".join(f"{';'.join(stack)} {count}\n" for stack, count in self.stacks.items())
+
+    def status(self) -> dict[str, Any]:
+        return {
+            "mode": self.mode,
+            "path": self.path,
+            "requests": self.requests,
+            "remaining": self.remaining,
+            "captured": self.captured,
+            "samples": self.samples,
+            "started_at": self.started_at,
+            "finished": self.finished,
+            "pid": os.getpid(),
+        }
+
+
+_session: Optional[ProfileSession] = None
+_current: ContextVar[Optional[_ProfiledRequest]] = ContextVar("profiled_request", default=None)
+
+
+def start(mode: Mode, requests: int, path: Optional[str], interval: float) -> ProfileSession:
+    global _session
+    stop()
+    _session = ProfileSession(mode, requests, path, interval)
+    return _session
+
+
+def stop() -> None:
+    global _session
+    if _session is not None:
+        _session.stop()
+    _session = None
+
+
+def current_session() -> Optional[ProfileSession]:
+    return _session
+
+
+def profiled(fn: Callable[..., T]) -> Callable[..., T]:
+    # Used by run_db so the service call of a profiled request is attributed to it on whichever
+    # thread it runs; every other call gets fn back untouched.
+    request = _current.get()
+    if request is None:
+        return fn
+
+    @wraps(fn)
+    def run(*args: Any, **kwargs: Any) -> T:
+        return request.run(fn, *args, **kwargs)
+
+    return run
+
+
+class _ProfiledCoroutine:
+    # Drives coro one step at a time with the profiler on only during each step, so the capture holds
+    # this request's code and not the event loop or other requests running in between.
+    def __init__(self, coro: Any, profile: cProfile.Profile) -> None:
+        self.coro = coro
+        self.profile = profile
+
+    def __await__(self) -> Any:
+        value, error = None, None
+        while True:
+            self.profile.enable()
+            try:
+                yielded = self.coro.throw(error) if error is not None else self.coro.send(value)
+            except StopIteration as stop:
+                return stop.value
+            finally:
+                self.profile.disable()
+            try:
+                value, error = (yield yielded), None
+            except BaseException as e:
+                value, error = None, e
+
+
+class ProfilerMiddleware:
+    def __init__(self, app: ASGIApp) -> None:
+        self.app = app
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        session = _session
+        request = session.claim(scope["path"]) if session is not None and scope["type"] == "http" else None
+        if request is None:
+            await self.app(scope, receive, send)
+            return
+
+        token = _current.set(request)
+        try:
+            if session.mode == "deterministic" and PROCESS_WIDE_CPROFILE:
+                await self.app(scope, receive, send)
+            elif session.mode == "deterministic":
+                profile = cProfile.Profile()
+                try:
+                    await _ProfiledCoroutine(self.app(scope, receive, send), profile)
+                finally:
+                    session.add_profile(profile)
+            else:
+                session.mark(request, (request.loop_thread, sys._getframe()))
+                await self.app(scope, receive, send)
+        finally:
+            _current.reset(token)
+            session.release(request)
@@ -0,0 +1,109 @@
+from __future__ import annotations
+import asyncio
+import threading
+from typing import AsyncIterator, Optional, Protocol
+
+from app.core.config import settings
+
+SUBSCRIBER_QUEUE_SIZE = 256
+
+
+class Subscription:
+    def __init__(self, broker: "MemoryBroker", channel: str) -> None:
+        self.channel = channel
+        self._broker = broker
+        self._loop = asyncio.get_running_loop()
+        self._queue: asyncio.Queue[str] = asyncio.Queue(maxsize=SUBSCRIBER_QUEUE_SIZE)
+
+    def _deliver(self, message: str) -> None:
+        try:
+            self._queue.put_nowait(message)
+        except asyncio.QueueFull:
+            # Slow watcher: drop the event; the version gap tells the client to refetch.
+            pass
+
+    async def listen(self, heartbeat: float) -> AsyncIterator[Optional[str]]:
+        while True:
+            try:
+                yield await asyncio.wait_for(self._queue.get(), timeout=heartbeat)
+            except asyncio.TimeoutError:
+                yield None
+
+    def close(self) -> None:
+        self._broker._unsubscribe(self)
+
+
+class Broker(Protocol):
+    def publish(self, channel: str, message: str) -> None: ...
+
+    def subscribe(self, channel: str) -> Subscription: ...
+
+
+class MemoryBroker:
+    def __init__(self) -> None:
+        self._subscribers: dict[str, set[Subscription]] = {}
+        self._lock = threading.Lock()
+
+    def publish(self, channel: str, message: str) -> None:
+        with self._lock:
+            subscribers = list(self._subscribers.get(channel, ()))
+        for sub in subscribers:
+            sub._loop.call_soon_threadsafe(sub._deliver, message)
+
+    def subscribe(self, channel: str) -> Subscription:
+        sub = Subscription(self, channel)
+        with self._lock:
+            self._subscribers.setdefault(channel, set()).add(sub)
+        return sub
+
+    def _unsubscribe(self, sub: Subscription) -> None:
+        with self._lock:
+            subs = self._subscribers.get(sub.channel)
+            if subs is not None:
+                subs.discard(sub)
+                if not subs:
+                    del self._subscribers[sub.channel]
+
+
+# Publishes through Redis; each worker holds one pattern subscription and fans out locally.
+class RedisBroker:
+    prefix = "pubsub:"
+
+    def __init__(self, url: str) -> None:
+        import redis
+
+        self._url = url
+        self._client = redis.Redis.from_url(url)
+        self._local = MemoryBroker()
+        self._listener: Optional[asyncio.Task] = None
+
+    def publish(self, channel: str, message: str) -> None:
+        self._client.publish(self.prefix + channel, message)
+
+    def subscribe(self, channel: str) -> Subscription:
+        if self._listener is None or self._listener.done():
+            self._listener = asyncio.get_running_loop().create_task(self._listen())
+        return self._local.subscribe(channel)
+
+    async def _listen(self) -> None:
+        import redis.asyncio
+
+        client = redis.asyncio.Redis.from_url(self._url, decode_responses=True)
+        pubsub = client.pubsub()
+        await pubsub.psubscribe(self.prefix + "*")
+        try:
+            async for message in pubsub.listen():
+                if message["type"] == "pmessage":
+                    self._local.publish(message["channel"][len(self.prefix):], message["data"])
+        finally:
+            await pubsub.aclose()
+            await client.aclose()
+
+
+def _build_broker() -> Broker:
+    if settings.redis_url:
+        return RedisBroker(settings.redis_url)
+    return MemoryBroker()
+
+
+broker: Broker = _build_broker()
@@ -0,0 +1,127 @@
+from __future__ import annotations
+import logging
+import time
+from contextvars import ContextVar
+from typing import Optional
+
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+from sqlalchemy.orm import ORMExecuteState, Session, raiseload
+from starlette.datastructures import MutableHeaders
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+from app.core.config import settings
+
+logger = logging.getLogger(__name__)
+
+
+class QueryStats:
+    __slots__ = ("count", "seconds", "slowest", "slowest_statement", "executions")
+
+    def __init__(self) -> None:
+        self.count = 0
+        self.seconds = 0.0
+        self.slowest = 0.0
+        self.slowest_statement: Optional[str] = None
+        self.executions: dict[str, int] = {}
+
+    def observe(self, statement: str, seconds: float) -> None:
+        self.count += 1
+        self.seconds += seconds
+        if seconds > self.slowest:
+            self.slowest = seconds
+            self.slowest_statement = statement
+        self.executions[statement] = self.executions.get(statement, 0) + 1
+
+
+# Set per request by QueryStatsMiddleware. run_in_threadpool and AsyncSession.run_sync both carry the
+# context along, so statements executed for a request land on its QueryStats on either stack.
+_current: ContextVar[Optional[QueryStats]] = ContextVar("query_stats", default=None)
+
+
+def current_query_stats() -> Optional[QueryStats]:
+    return _current.get()
+
+
+def install_query_stats(engine: Engine) -> None:
+    @event.listens_for(engine, "before_cursor_execute")
+    def _start(conn, cursor, statement, parameters, context, executemany) -> None:
+        context.query_started_at = time.perf_counter()
+
+    @event.listens_for(engine, "after_cursor_execute")
+    def _finish(conn, cursor, statement, parameters, context, executemany) -> None:
+        elapsed = time.perf_counter() - context.query_started_at
+        stats = _current.get()
+        if stats is not None:
+            stats.observe(statement, elapsed)
+        if elapsed * 1000 >= settings.db_slow_query_ms:
+            logger.warning("Slow query (%.1f ms): %s", elapsed * 1000, statement)
+
+
+def install_strict_loading() -> None:
+    # Every ORM select gets raiseload("*"), so touching a relationship that the query did not load
+    # eagerly raises instead of quietly issuing one more SELECT per row.
+    @event.listens_for(Session, "do_orm_execute")
+    def _raise_on_lazy_load(state: ORMExecuteState) -> None:
+        if state.is_select and not state.is_column_load and not state.is_relationship_load:
+            state.statement = state.statement.options(raiseload("*"))
+
+
+class QueryStatsMiddleware:
+    def __init__(self, app: ASGIApp) -> None:
+        self.app = app
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        stats = QueryStats()
+        status_code = 500
+
+        async def send_with_stats(message: Message) -> None:
+            nonlocal status_code
+            if message["type"] == "http.response.start":
+                status_code = message["status"]
+                headers = MutableHeaders(scope=message)
+                headers["X-DB-Queries"] = str(stats.count)
+                headers["X-DB-Time-Ms"] = f"{stats.seconds * 1000:.1f}"
+            await send(message)
+
+        token = _current.set(stats)
+        try:
+            await self.app(scope, receive, send_with_stats)
+        finally:
+            _current.reset(token)
+            _log_request(scope, status_code, stats)
+
+
+def route_template(scope: Scope) -> Optional[str]:
+    # The matched route's path_format may be relative to an included router's prefix; the prefix is
+    # whatever part of the request path the formatted route does not cover.
+    route = scope.get("route")
+    path_format = getattr(route, "path_format", None)
+    if path_format is None:
+        return None
+    path = scope["path"]
+    suffix = path_format.format(**scope.get("path_params", {}))
+    prefix = path[: -len(suffix)] if suffix and path.endswith(suffix) else ""
+    return prefix + path_format
+
+
+def _log_request(scope: Scope, status_code: int, stats: QueryStats) -> None:
+    route = route_template(scope) or scope["path"]
+    logger.info(
+        "%s %s %d: %d queries in %.1f ms",
+        scope["method"], route, status_code, stats.count, stats.seconds * 1000,
+        extra={
+            "route": route,
+            "db_queries": stats.count,
+            "db_time_ms": round(stats.seconds * 1000, 1),
+            "db_slowest_ms": round(stats.slowest * 1000, 1),
+            "db_slowest_statement": stats.slowest_statement,
+        },
+    )
+    for statement, executions in stats.executions.items():
+        if executions >= settings.db_n_plus_one_threshold:
+            logger.warning("Possible N+1 on %s %s: %d executions of %s", scope["method"], route, executions, statement)
@@ -0,0 +1,33 @@
+from __future__ import annotations
+import json
+from datetime import date
+from typing import Any
+
+from fastapi.responses import JSONResponse
+
+try:
+    import orjson
+except ImportError:  # orjson is optional; the stdlib fallback produces the same JSON, only slower.
+    orjson = None
+
+
+def _default(value: Any) -> Any:
+    if isinstance(value, date):
+        return value.isoformat()
+    raise TypeError(f"{type(value).__name__} is not JSON serializable")
+
+
+def dumps(content: Any) -> bytes:
+    if orjson is not None:
+        return orjson.dumps(content)
+    return json.dumps(content, ensure_ascii=False, separators=(",", ":"), default=_default).encode()
+
+
+def loads(data: str | bytes) -> Any:
+    return orjson.loads(data) if orjson is not None else json.loads(data)
+
+
+class FastJSONResponse(JSONResponse):
+    # For bodies that are already plain dicts/lists: no response_model validation, one encoder pass.
+    def render(self, content: Any) -> bytes:
+        return dumps(content)
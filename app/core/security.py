@@ -1,12 +1,37 @@
+import asyncio
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime, timedelta, timezone
-from typing import Any, Optional
+from typing import Any, Callable, Optional, TypeVar
 
 from jose import jwt
 from passlib.context import CryptContext
 
 from app.core.config import settings
+from app.core.metrics import password_hash_seconds
+
+T = TypeVar("T")
+
+# min == max == default: hashes made with any other round count are flagged for rehash on login.
+pwd_context = CryptContext(
+    schemes=["pbkdf2_sha256"],
+    deprecated="auto",
+    pbkdf2_sha256__default_rounds=settings.password_hash_rounds,
+    pbkdf2_sha256__min_rounds=settings.password_hash_rounds,
+    pbkdf2_sha256__max_rounds=settings.password_hash_rounds,
+)
+
+# hashlib's pbkdf2 releases the GIL, so a small dedicated thread pool keeps hashing off the event
+# loop and off the request threadpool. The semaphore bounds queued work so a login storm is
+# turned away immediately instead of piling up behind the workers.
+_hash_executor = ThreadPoolExecutor(max_workers=settings.password_hash_workers, thread_name_prefix="pwhash")
+_hash_slots = threading.BoundedSemaphore(settings.password_hash_workers + settings.password_hash_queue_size)
+
+
+class HashingPoolBusy(Exception):
+    pass
 
-pwd_context = CryptContext(schemes=["pbkdf2_sha256"], deprecated="auto")
 
 def hash_password(password: str) -> str:
     return pwd_context.hash(password)
@@ -16,6 +41,34 @@ def verify_password(plain_password: str, hashed_password: str) -> bool:
     return pwd_context.verify(plain_password, hashed_password)
 
 
+def _release_slot(_future) -> None:
+    _hash_slots.release()
+
+
+def _timed(operation: str, fn: Callable[..., T], *args: Any) -> T:
+    started = time.perf_counter()
+    try:
+        return fn(*args)
+    finally:
+        password_hash_seconds.observe(time.perf_counter() - started, operation)
+
+
+def _offload(operation: str, fn: Callable[..., T], *args: Any) -> "asyncio.Future[T]":
+    if not _hash_slots.acquire(blocking=False):
+        raise HashingPoolBusy()
+    future = _hash_executor.submit(_timed, operation, fn, *args)
+    future.add_done_callback(_release_slot)
+    return asyncio.wrap_future(future)
+
+
+async def hash_password_async(password: str) -> str:
+    return await _offload("hash", pwd_context.hash, password)
+
+
+async def verify_and_update_password(plain_password: str, hashed_password: str) -> tuple[bool, Optional[str]]:
+    return await _offload("verify", pwd_context.verify_and_update, plain_password, hashed_password)
+
+
 def create_access_token(subject: str, expires_minutes: Optional[int] = None, extra_claims: Optional[dict[str, Any]] = None) -> str:
     expire_delta = timedelta(minutes=expires_minutes or settings.jwt_access_token_expire_minutes)
     expire = datetime.now(timezone.utc) + expire_delta
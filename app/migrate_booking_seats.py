@@ -0,0 +1,59 @@
+"""Backfill booking_seats from the JSON Booking.seats of bookings made before the table existed.
+
+Safe to run while the app is serving: bookings are processed in small id-ordered batches, each in its
+own transaction, and a booking that already has seat rows is skipped, so the script can be stopped and
+re-run at any point.
+
+    python -m app.migrate_booking_seats --batch-size 500
+"""
+from __future__ import annotations
+import argparse
+
+from sqlalchemy import exists
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.orm import Session
+
+from app.core.database import SessionLocal
+from app.models.models import Booking, BookingSeat
+
+
+def migrate(batch_size: int) -> None:
+    db: Session = SessionLocal()
+    migrated, conflicts, last_id = 0, [], 0
+    try:
+        while True:
+            batch = (
+                db.query(Booking.id, Booking.show_id, Booking.seats)
+                .filter(Booking.id > last_id, ~exists().where(BookingSeat.booking_id == Booking.id))
+                .order_by(Booking.id)
+                .limit(batch_size)
+                .all()
+            )
+            if not batch:
+                break
+            for booking_id, show_id, seats in batch:
+                try:
+                    with db.begin_nested():
+                        db.add_all(
+                            BookingSeat(booking_id=booking_id, show_id=show_id, seat_row=int(s["row"]), seat_col=int(s["col"]))
+                            for s in seats
+                        )
+                    migrated += 1
+                except IntegrityError:
+                    # Two legacy bookings hold the same seat; leave it for a human to resolve.
+                    conflicts.append(booking_id)
+            db.commit()
+            last_id = batch[-1][0]
+    finally:
+        db.close()
+
+    print(f"migrated {migrated} bookings")
+    if conflicts:
+        print(f"{len(conflicts)} bookings share a seat with another booking and were skipped: {conflicts}")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--batch-size", type=int, default=500)
+    args = parser.parse_args()
+    migrate(args.batch_size)
@@ -1,8 +1,8 @@
 from __future__ import annotations
 from datetime import datetime
-from typing import List
+from typing import List, Optional
 
-from sqlalchemy import Column, Integer, String, ForeignKey, DateTime, Text, JSON, UniqueConstraint
+from sqlalchemy import Column, Integer, String, ForeignKey, DateTime, Text, JSON, LargeBinary, UniqueConstraint, Index
 from sqlalchemy.orm import relationship, Mapped, mapped_column
 
 from app.core.database import Base
@@ -21,6 +21,7 @@ class User(Base, TimestampMixin):
     email: Mapped[str] = mapped_column(String(255), unique=True, index=True, nullable=False)
     password: Mapped[str] = mapped_column(String(255), nullable=False)
     is_admin: Mapped[int] = mapped_column(Integer, default=0, nullable=False)
+    token_version: Mapped[int] = mapped_column(Integer, default=0, nullable=False)
 
     bookings: Mapped[List["Booking"]] = relationship("Booking", back_populates="user")
 
@@ -47,6 +48,24 @@ class Screen(Base, TimestampMixin):
 
     cinema: Mapped[Cinema] = relationship("Cinema", back_populates="screens")
     shows: Mapped[List["Show"]] = relationship("Show", back_populates="screen", cascade="all, delete-orphan")
+    layouts: Mapped[List["ScreenLayout"]] = relationship("ScreenLayout", back_populates="screen", cascade="all, delete-orphan")
+
+
+class ScreenLayout(Base, TimestampMixin):
+    # Append-only: a layout change inserts a new row and the newest row per screen is the current one.
+    __tablename__ = "screen_layouts"
+    __table_args__ = (
+        Index("ix_screen_layout_screen_id_id", "screen_id", "id"),
+    )
+
+    id: Mapped[int] = mapped_column(Integer, primary_key=True)
+    screen_id: Mapped[int] = mapped_column(ForeignKey("screens.id", ondelete="CASCADE"), nullable=False)
+    rows: Mapped[int] = mapped_column(Integer, nullable=False)
+    cols: Mapped[int] = mapped_column(Integer, nullable=False)
+    seats: Mapped[bytes] = mapped_column(LargeBinary, nullable=False)  # one bit per position, row-major; set = seat exists
+    capacity: Mapped[int] = mapped_column(Integer, nullable=False)
+
+    screen: Mapped[Screen] = relationship("Screen", back_populates="layouts")
 
 
 class Movie(Base, TimestampMixin):
@@ -74,10 +93,16 @@ class Show(Base, TimestampMixin):
     movie: Mapped[Movie] = relationship("Movie", back_populates="shows")
     screen: Mapped[Screen] = relationship("Screen", back_populates="shows")
     bookings: Mapped[List["Booking"]] = relationship("Booking", back_populates="show", cascade="all, delete-orphan")
+    seat_map: Mapped[Optional["ShowSeatMap"]] = relationship("ShowSeatMap", back_populates="show", cascade="all, delete-orphan", uselist=False)
+    holds: Mapped[List["SeatHold"]] = relationship("SeatHold", back_populates="show", cascade="all, delete-orphan")
+    sales: Mapped[Optional["ShowSales"]] = relationship("ShowSales", back_populates="show", cascade="all, delete-orphan", uselist=False)
 
 
 class Booking(Base, TimestampMixin):
     __tablename__ = "bookings"
+    __table_args__ = (
+        Index("ix_bookings_user_created", "user_id", "created_at"),
+    )
 
     id: Mapped[int] = mapped_column(Integer, primary_key=True)
     user_id: Mapped[int] = mapped_column(ForeignKey("users.id", ondelete="CASCADE"), nullable=False, index=True)
@@ -86,3 +111,55 @@ class Booking(Base, TimestampMixin):
 
     user: Mapped[User] = relationship("User", back_populates="bookings")
     show: Mapped[Show] = relationship("Show", back_populates="bookings")
+    seat_claims: Mapped[List["BookingSeat"]] = relationship("BookingSeat", back_populates="booking", cascade="all, delete-orphan")
+
+
+class BookingSeat(Base):
+    __tablename__ = "booking_seats"
+    __table_args__ = (
+        UniqueConstraint("show_id", "seat_row", "seat_col", name="uq_booking_seat"),
+    )
+
+    id: Mapped[int] = mapped_column(Integer, primary_key=True)
+    booking_id: Mapped[int] = mapped_column(ForeignKey("bookings.id", ondelete="CASCADE"), nullable=False, index=True)
+    show_id: Mapped[int] = mapped_column(ForeignKey("shows.id", ondelete="CASCADE"), nullable=False)
+    seat_row: Mapped[int] = mapped_column(Integer, nullable=False)
+    seat_col: Mapped[int] = mapped_column(Integer, nullable=False)
+
+    booking: Mapped[Booking] = relationship("Booking", back_populates="seat_claims")
+
+
+class ShowSeatMap(Base, TimestampMixin):
+    __tablename__ = "show_seat_maps"
+
+    show_id: Mapped[int] = mapped_column(ForeignKey("shows.id", ondelete="CASCADE"), primary_key=True)
+    occupied: Mapped[bytes] = mapped_column(LargeBinary, nullable=False)  # one bit per seat, row-major
+    version: Mapped[int] = mapped_column(Integer, default=0, nullable=False)
+
+    show: Mapped[Show] = relationship("Show", back_populates="seat_map")
+
+
+class ShowSales(Base, TimestampMixin):
+    # Counters kept in step with bookings under the show's seat map lock, so reports never scan bookings.
+    __tablename__ = "show_sales"
+
+    show_id: Mapped[int] = mapped_column(ForeignKey("shows.id", ondelete="CASCADE"), primary_key=True)
+    seats_sold: Mapped[int] = mapped_column(Integer, default=0, nullable=False)
+    bookings: Mapped[int] = mapped_column(Integer, default=0, nullable=False)
+
+    show: Mapped[Show] = relationship("Show", back_populates="sales")
+
+
+class SeatHold(Base, TimestampMixin):
+    __tablename__ = "seat_holds"
+    __table_args__ = (
+        Index("ix_seat_hold_show_expiry", "show_id", "expires_at"),
+    )
+
+    id: Mapped[int] = mapped_column(Integer, primary_key=True)
+    user_id: Mapped[int] = mapped_column(ForeignKey("users.id", ondelete="CASCADE"), nullable=False, index=True)
+    show_id: Mapped[int] = mapped_column(ForeignKey("shows.id", ondelete="CASCADE"), nullable=False)
+    seats: Mapped[list] = mapped_column(JSON, nullable=False)  # list of {row:int, col:int}
+    expires_at: Mapped[datetime] = mapped_column(DateTime, nullable=False, index=True)
+
+    show: Mapped[Show] = relationship("Show", back_populates="holds")
@@ -0,0 +1,27 @@
+from __future__ import annotations
+
+from sqlalchemy.orm import Session
+
+from app.core.database import SessionLocal
+from app.models.models import Show
+from app.services.booking_service import _get_seat_map, invalidate_seat_availability, rebuild_seat_map
+from app.services.layout_service import show_layout
+
+
+def rebuild() -> None:
+    # Safe while bookings are live: each show is rebuilt in its own transaction with its seat map locked,
+    # in show_id order, so a booking either commits before the recount or waits for it.
+    db: Session = SessionLocal()
+    try:
+        show_ids = [show_id for (show_id,) in db.query(Show.id).order_by(Show.id)]
+        for show_id in show_ids:
+            _get_seat_map(db, show_id, lock=True)
+            rebuild_seat_map(db, show_id, show_layout(db, show_id))
+            db.commit()
+            invalidate_seat_availability(show_id)
+    finally:
+        db.close()
+
+
+if __name__ == "__main__":
+    rebuild()
@@ -6,4 +6,5 @@ __all__ = [
     "movies",
     "shows",
     "bookings",
+    "admin",
 ]
@@ -0,0 +1,104 @@
+from datetime import datetime
+from typing import Literal
+
+from fastapi import APIRouter, Depends, HTTPException, Query, status
+from fastapi.responses import PlainTextResponse, StreamingResponse
+
+from app.core import profiler
+
+from app.core.database import DbSession, async_engine, close_db, engine, get_session, run_db
+from app.core.pool import pool_stats
+from app.schemas.schemas import HotFunction, ProfileStart, ProfileStatus, SalesSummary
+from app.services import analytics_service, auth_service, export_service
+
+router = APIRouter()
+
+
+@router.get("/db-pool")
+async def db_pool(current_user=Depends(auth_service.get_current_user)):
+    auth_service.ensure_admin(current_user)
+    stats = {"sync": pool_stats(engine)}
+    if async_engine is not None:
+        stats["async"] = pool_stats(async_engine.sync_engine)
+    return stats
+
+
+@router.get("/sales", response_model=list[SalesSummary])
+async def sales(
+    group_by: Literal["show", "movie", "cinema", "day"] = "show",
+    start_from: datetime | None = None,
+    start_to: datetime | None = None,
+    cinema_id: int | None = None,
+    movie_id: int | None = None,
+    db: DbSession = Depends(get_session),
+    current_user=Depends(auth_service.get_current_user),
+):
+    auth_service.ensure_admin(current_user)
+    return await run_db(db, analytics_service.sales_summary, group_by, start_from, start_to, cinema_id=cinema_id, movie_id=movie_id)
+
+
+@router.get("/exports/bookings")
+async def export_bookings(
+    format: Literal["csv", "ndjson"] = "csv",
+    show_id: int | None = None,
+    cinema_id: int | None = None,
+    start_from: datetime | None = None,
+    start_to: datetime | None = None,
+    db: DbSession = Depends(get_session),
+    current_user=Depends(auth_service.get_current_user),
+):
+    auth_service.ensure_admin(current_user)
+    # The export opens its own session; give the request's connection back for the length of the download.
+    await close_db(db)
+    media_type = "text/csv" if format == "csv" else "application/x-ndjson"
+    return StreamingResponse(
+        export_service.export_bookings(format, show_id, cinema_id, start_from, start_to),
+        media_type=media_type,
+        headers={"Content-Disposition": f'attachment; filename="bookings.{format}"'},
+    )
+
+
+def _profile_session() -> profiler.ProfileSession:
+    session = profiler.current_session()
+    if session is None:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="No profile on this worker")
+    return session
+
+
+@router.post("/profile", response_model=ProfileStatus, status_code=status.HTTP_201_CREATED)
+async def start_profile(payload: ProfileStart, current_user=Depends(auth_service.get_current_user)):
+    auth_service.ensure_admin(current_user)
+    try:
+        return profiler.start(payload.mode, payload.requests, payload.path, payload.interval_ms / 1000).status()
+    except ValueError:
+        # Python 3.12+: cProfile is process-wide and something else in this worker is already profiling it.
+        raise HTTPException(status_code=status.HTTP_409_CONFLICT, detail="Another profiler is active in this worker")
+
+
+@router.get("/profile", response_model=ProfileStatus)
+async def profile_status(current_user=Depends(auth_service.get_current_user)):
+    auth_service.ensure_admin(current_user)
+    return _profile_session().status()
+
+
+@router.get("/profile/result", response_model=list[HotFunction])
+async def profile_result(
+    format: Literal["stats", "collapsed"] = "stats",
+    sort: Literal["self", "total"] = "self",
+    limit: int = Query(default=50, ge=1, le=1000),
+    current_user=Depends(auth_service.get_current_user),
+):
+    auth_service.ensure_admin(current_user)
+    session = _profile_session()
+    if format == "stats":
+        return session.hot_functions(sort, limit)
+    if session.mode != "sampling":
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="Collapsed stacks need a sampling profile")
+    return PlainTextResponse(session.collapsed(), headers={"Content-Disposition": 'attachment; filename="profile.folded"'})
+
+
+@router.delete("/profile", status_code=status.HTTP_204_NO_CONTENT)
+async def stop_profile(current_user=Depends(auth_service.get_current_user)):
+    auth_service.ensure_admin(current_user)
+    profiler.stop()
+    return None
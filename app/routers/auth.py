@@ -1,8 +1,7 @@
 from fastapi import APIRouter, Depends, HTTPException, status
 from fastapi.security import OAuth2PasswordRequestForm
-from sqlalchemy.orm import Session
 
-from app.core.database import get_db
+from app.core.database import DbSession, get_session, run_db
 from app.schemas.schemas import UserCreate, UserOut, Token
 from app.services import auth_service
 
@@ -10,20 +9,26 @@ router = APIRouter()
 
 
 @router.post("/signup", response_model=UserOut, status_code=status.HTTP_201_CREATED)
-def signup(payload: UserCreate, db: Session = Depends(get_db)):
-    user = auth_service.register_user(db, payload.name, payload.email, payload.password)
+async def signup(payload: UserCreate, db: DbSession = Depends(get_session)):
+    user = await auth_service.register_user(db, payload.name, payload.email, payload.password)
     return user
 
 
 @router.post("/login", response_model=Token)
-def login(form_data: OAuth2PasswordRequestForm = Depends(), db: Session = Depends(get_db)):
-    user = auth_service.authenticate_user(db, form_data.username, form_data.password)
+async def login(form_data: OAuth2PasswordRequestForm = Depends(), db: DbSession = Depends(get_session)):
+    user = await auth_service.authenticate_user(db, form_data.username, form_data.password)
     if not user:
         raise HTTPException(status_code=status.HTTP_401_UNAUTHORIZED, detail="Invalid credentials")
-    token = auth_service.create_user_token(user.id)
+    token = auth_service.create_user_token(user)
     return Token(access_token=token)
 
 
 @router.get("/me", response_model=UserOut)
-def me(current_user=Depends(auth_service.get_current_user)):
+async def me(current_user=Depends(auth_service.get_current_user)):
     return current_user
+
+
+@router.post("/logout", status_code=status.HTTP_204_NO_CONTENT)
+async def logout(db: DbSession = Depends(get_session), current_user=Depends(auth_service.get_current_user)):
+    await run_db(db, auth_service.revoke_user_tokens, current_user.id)
+    return None
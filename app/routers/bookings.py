@@ -1,25 +1,63 @@
-from fastapi import APIRouter, Depends, status
-from sqlalchemy.orm import Session
+from typing import Literal
 
-from app.core.database import get_db
-from app.schemas.schemas import BookingCreate, BookingOut
-from app.services import booking_service, auth_service
+from fastapi import APIRouter, Depends, Query, Response, status
+
+from app.core.database import DbSession, get_session, run_db
+from app.core.pagination import DEFAULT_LIMIT, MAX_LIMIT, set_next_cursor
+from app.schemas.schemas import BestAvailableCreate, BookingBatchCreate, BookingBatchResult, BookingCreate, BookingHistoryItem, BookingOut, HoldCreate, HoldOut
+from app.services import booking_service, auth_service, hold_service
 
 router = APIRouter()
 
 
 @router.post("/", response_model=BookingOut, status_code=status.HTTP_201_CREATED)
-def create_booking(payload: BookingCreate, db: Session = Depends(get_db), current_user=Depends(auth_service.get_current_user)):
-    booking = booking_service.create_booking(db, current_user.id, payload.show_id, [s.model_dump() for s in payload.seats])
+async def create_booking(payload: BookingCreate, db: DbSession = Depends(get_session), current_user=Depends(auth_service.get_current_user)):
+    booking = await run_db(db, booking_service.create_booking, current_user.id, payload.show_id, [s.model_dump() for s in payload.seats])
     return booking
 
 
-@router.get("/me", response_model=list[BookingOut])
-def my_bookings(db: Session = Depends(get_db), current_user=Depends(auth_service.get_current_user)):
-    return booking_service.list_user_bookings(db, current_user.id)
+@router.post("/best-available", response_model=BookingOut, status_code=status.HTTP_201_CREATED)
+async def book_best_available(payload: BestAvailableCreate, db: DbSession = Depends(get_session), current_user=Depends(auth_service.get_current_user)):
+    return await run_db(db, booking_service.book_best_available, current_user.id, payload.show_id, payload.quantity, payload.zone)
+
+
+@router.post("/batch", response_model=BookingBatchResult)
+async def create_bookings(payload: BookingBatchCreate, db: DbSession = Depends(get_session), current_user=Depends(auth_service.get_current_user)):
+    items = [{"show_id": item.show_id, "seats": [s.model_dump() for s in item.seats]} for item in payload.items]
+    return await run_db(db, booking_service.create_bookings, current_user.id, items, payload.atomic)
+
+
+@router.post("/holds", response_model=HoldOut, status_code=status.HTTP_201_CREATED)
+async def place_hold(payload: HoldCreate, db: DbSession = Depends(get_session), current_user=Depends(auth_service.get_current_user)):
+    return await run_db(db, hold_service.place_hold, current_user.id, payload.show_id, [s.model_dump() for s in payload.seats])
+
+
+@router.post("/holds/{hold_id}/confirm", response_model=BookingOut, status_code=status.HTTP_201_CREATED)
+async def confirm_hold(hold_id: int, db: DbSession = Depends(get_session), current_user=Depends(auth_service.get_current_user)):
+    return await run_db(db, hold_service.confirm_hold, current_user.id, hold_id)
+
+
+@router.delete("/holds/{hold_id}", status_code=status.HTTP_204_NO_CONTENT)
+async def release_hold(hold_id: int, db: DbSession = Depends(get_session), current_user=Depends(auth_service.get_current_user)):
+    await run_db(db, hold_service.release_hold, current_user.id, hold_id)
+    return None
+
+
+@router.get("/me", response_model=list[BookingHistoryItem])
+async def my_bookings(
+    response: Response,
+    limit: int = Query(DEFAULT_LIMIT, ge=1, le=MAX_LIMIT),
+    cursor: str | None = None,
+    when: Literal["all", "upcoming", "past"] = "all",
+    db: DbSession = Depends(get_session),
+    current_user=Depends(auth_service.get_current_user),
+):
+    bookings, next_cursor = await run_db(db, booking_service.list_user_bookings, current_user.id, limit, cursor, when)
+    set_next_cursor(response, next_cursor)
+    return bookings
 
 
 @router.delete("/{booking_id}", status_code=status.HTTP_204_NO_CONTENT)
-def cancel_booking(booking_id: int, db: Session = Depends(get_db), current_user=Depends(auth_service.get_current_user)):
-    booking_service.cancel_booking(db, current_user.id, booking_id)
+async def cancel_booking(booking_id: int, db: DbSession = Depends(get_session), current_user=Depends(auth_service.get_current_user)):
+    await run_db(db, booking_service.cancel_booking, current_user.id, booking_id)
     return None
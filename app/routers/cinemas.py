@@ -1,7 +1,7 @@
-from fastapi import APIRouter, Depends, HTTPException, status
-from sqlalchemy.orm import Session
+from fastapi import APIRouter, Depends, HTTPException, Query, status
 
-from app.core.database import get_db
+from app.core.database import DbSession, get_session, run_db
+from app.core.pagination import DEFAULT_LIMIT, MAX_LIMIT, page_response
 from app.schemas.schemas import CinemaOut, CinemaCreate, CinemaUpdate
 from app.services import cinema_service, auth_service
 
@@ -9,38 +9,44 @@ router = APIRouter()
 
 
 @router.get("/", response_model=list[CinemaOut])
-def list_all(db: Session = Depends(get_db)):
-    return cinema_service.list_cinemas(db)
+async def list_all(
+    limit: int = Query(DEFAULT_LIMIT, ge=1, le=MAX_LIMIT),
+    cursor: str | None = None,
+    location: str | None = None,
+    db: DbSession = Depends(get_session),
+):
+    cinemas, next_cursor = await run_db(db, cinema_service.read_cinemas, limit, cursor, location=location)
+    return page_response(cinemas, next_cursor)
 
 
 @router.get("/{cinema_id}", response_model=CinemaOut)
-def get_one(cinema_id: int, db: Session = Depends(get_db)):
-    cinema = cinema_service.get_cinema(db, cinema_id)
+async def get_one(cinema_id: int, db: DbSession = Depends(get_session)):
+    cinema = await run_db(db, cinema_service.read_cinema, cinema_id)
     if not cinema:
         raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Cinema not found")
     return cinema
 
 
 @router.post("/", response_model=CinemaOut, status_code=status.HTTP_201_CREATED)
-def create(payload: CinemaCreate, db: Session = Depends(get_db), current_user=Depends(auth_service.get_current_user)):
+async def create(payload: CinemaCreate, db: DbSession = Depends(get_session), current_user=Depends(auth_service.get_current_user)):
     auth_service.ensure_admin(current_user)
-    return cinema_service.create_cinema(db, payload.name, payload.location)
+    return await run_db(db, cinema_service.create_cinema, payload.name, payload.location)
 
 
 @router.put("/{cinema_id}", response_model=CinemaOut)
-def update(cinema_id: int, payload: CinemaUpdate, db: Session = Depends(get_db), current_user=Depends(auth_service.get_current_user)):
+async def update(cinema_id: int, payload: CinemaUpdate, db: DbSession = Depends(get_session), current_user=Depends(auth_service.get_current_user)):
     auth_service.ensure_admin(current_user)
-    cinema = cinema_service.get_cinema(db, cinema_id)
+    cinema = await run_db(db, cinema_service.get_cinema, cinema_id)
     if not cinema:
         raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Cinema not found")
-    return cinema_service.update_cinema(db, cinema, payload.name, payload.location)
+    return await run_db(db, cinema_service.update_cinema, cinema, payload.name, payload.location)
 
 
 @router.delete("/{cinema_id}", status_code=status.HTTP_204_NO_CONTENT)
-def delete(cinema_id: int, db: Session = Depends(get_db), current_user=Depends(auth_service.get_current_user)):
+async def delete(cinema_id: int, db: DbSession = Depends(get_session), current_user=Depends(auth_service.get_current_user)):
     auth_service.ensure_admin(current_user)
-    cinema = cinema_service.get_cinema(db, cinema_id)
+    cinema = await run_db(db, cinema_service.get_cinema, cinema_id)
     if not cinema:
         raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Cinema not found")
-    cinema_service.delete_cinema(db, cinema)
+    await run_db(db, cinema_service.delete_cinema, cinema)
     return None
@@ -1,7 +1,7 @@
-from fastapi import APIRouter, Depends, HTTPException, status
-from sqlalchemy.orm import Session
+from fastapi import APIRouter, Depends, HTTPException, Query, status
 
-from app.core.database import get_db
+from app.core.database import DbSession, get_session, run_db
+from app.core.pagination import DEFAULT_LIMIT, MAX_LIMIT, page_response
 from app.schemas.schemas import MovieOut, MovieCreate, MovieUpdate
 from app.services import movie_service, auth_service
 
@@ -9,38 +9,44 @@ router = APIRouter()
 
 
 @router.get("/", response_model=list[MovieOut])
-def list_all(db: Session = Depends(get_db)):
-    return movie_service.list_movies(db)
+async def list_all(
+    limit: int = Query(DEFAULT_LIMIT, ge=1, le=MAX_LIMIT),
+    cursor: str | None = None,
+    title: str | None = None,
+    db: DbSession = Depends(get_session),
+):
+    movies, next_cursor = await run_db(db, movie_service.read_movies, limit, cursor, title=title)
+    return page_response(movies, next_cursor)
 
 
 @router.get("/{movie_id}", response_model=MovieOut)
-def get_one(movie_id: int, db: Session = Depends(get_db)):
-    movie = movie_service.get_movie(db, movie_id)
+async def get_one(movie_id: int, db: DbSession = Depends(get_session)):
+    movie = await run_db(db, movie_service.read_movie, movie_id)
     if not movie:
         raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Movie not found")
     return movie
 
 
 @router.post("/", response_model=MovieOut, status_code=status.HTTP_201_CREATED)
-def create(payload: MovieCreate, db: Session = Depends(get_db), current_user=Depends(auth_service.get_current_user)):
+async def create(payload: MovieCreate, db: DbSession = Depends(get_session), current_user=Depends(auth_service.get_current_user)):
     auth_service.ensure_admin(current_user)
-    return movie_service.create_movie(db, payload.title, payload.description, payload.duration)
+    return await run_db(db, movie_service.create_movie, payload.title, payload.description, payload.duration)
 
 
 @router.put("/{movie_id}", response_model=MovieOut)
-def update(movie_id: int, payload: MovieUpdate, db: Session = Depends(get_db), current_user=Depends(auth_service.get_current_user)):
+async def update(movie_id: int, payload: MovieUpdate, db: DbSession = Depends(get_session), current_user=Depends(auth_service.get_current_user)):
     auth_service.ensure_admin(current_user)
-    movie = movie_service.get_movie(db, movie_id)
+    movie = await run_db(db, movie_service.get_movie, movie_id)
     if not movie:
         raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Movie not found")
-    return movie_service.update_movie(db, movie, payload.title, payload.description, payload.duration)
+    return await run_db(db, movie_service.update_movie, movie, payload.title, payload.description, payload.duration)
 
 
 @router.delete("/{movie_id}", status_code=status.HTTP_204_NO_CONTENT)
-def delete(movie_id: int, db: Session = Depends(get_db), current_user=Depends(auth_service.get_current_user)):
+async def delete(movie_id: int, db: DbSession = Depends(get_session), current_user=Depends(auth_service.get_current_user)):
     auth_service.ensure_admin(current_user)
-    movie = movie_service.get_movie(db, movie_id)
+    movie = await run_db(db, movie_service.get_movie, movie_id)
     if not movie:
         raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Movie not found")
-    movie_service.delete_movie(db, movie)
+    await run_db(db, movie_service.delete_movie, movie)
     return None
@@ -1,46 +1,69 @@
-from fastapi import APIRouter, Depends, HTTPException, status
-from sqlalchemy.orm import Session
+from fastapi import APIRouter, Depends, HTTPException, Query, status
 
-from app.core.database import get_db
-from app.schemas.schemas import ScreenOut, ScreenCreate, ScreenUpdate
+from app.core.database import DbSession, get_session, run_db
+from app.core.pagination import DEFAULT_LIMIT, MAX_LIMIT, page_response
+from app.schemas.schemas import ScreenOut, ScreenCreate, ScreenUpdate, ScreenLayoutIn, ScreenLayoutOut
 from app.services import screen_service, auth_service
 
 router = APIRouter()
 
 
 @router.get("/", response_model=list[ScreenOut])
-def list_all(db: Session = Depends(get_db)):
-    return screen_service.list_screens(db)
+async def list_all(
+    limit: int = Query(DEFAULT_LIMIT, ge=1, le=MAX_LIMIT),
+    cursor: str | None = None,
+    cinema_id: int | None = None,
+    db: DbSession = Depends(get_session),
+):
+    screens, next_cursor = await run_db(db, screen_service.read_screens, limit, cursor, cinema_id=cinema_id)
+    return page_response(screens, next_cursor)
 
 
 @router.get("/{screen_id}", response_model=ScreenOut)
-def get_one(screen_id: int, db: Session = Depends(get_db)):
-    screen = screen_service.get_screen(db, screen_id)
+async def get_one(screen_id: int, db: DbSession = Depends(get_session)):
+    screen = await run_db(db, screen_service.read_screen, screen_id)
     if not screen:
         raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Screen not found")
     return screen
 
 
+@router.get("/{screen_id}/layout", response_model=ScreenLayoutOut)
+async def get_layout(screen_id: int, db: DbSession = Depends(get_session)):
+    screen = await run_db(db, screen_service.get_screen, screen_id)
+    if not screen:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Screen not found")
+    return await run_db(db, screen_service.get_screen_layout, screen)
+
+
+@router.put("/{screen_id}/layout", response_model=ScreenLayoutOut)
+async def set_layout(screen_id: int, payload: ScreenLayoutIn, db: DbSession = Depends(get_session), current_user=Depends(auth_service.get_current_user)):
+    auth_service.ensure_admin(current_user)
+    screen = await run_db(db, screen_service.get_screen, screen_id)
+    if not screen:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Screen not found")
+    return await run_db(db, screen_service.set_screen_layout, screen, payload.seats)
+
+
 @router.post("/", response_model=ScreenOut, status_code=status.HTTP_201_CREATED)
-def create(payload: ScreenCreate, db: Session = Depends(get_db), current_user=Depends(auth_service.get_current_user)):
+async def create(payload: ScreenCreate, db: DbSession = Depends(get_session), current_user=Depends(auth_service.get_current_user)):
     auth_service.ensure_admin(current_user)
-    return screen_service.create_screen(db, payload.cinema_id, payload.name)
+    return await run_db(db, screen_service.create_screen, payload.cinema_id, payload.name)
 
 
 @router.put("/{screen_id}", response_model=ScreenOut)
-def update(screen_id: int, payload: ScreenUpdate, db: Session = Depends(get_db), current_user=Depends(auth_service.get_current_user)):
+async def update(screen_id: int, payload: ScreenUpdate, db: DbSession = Depends(get_session), current_user=Depends(auth_service.get_current_user)):
     auth_service.ensure_admin(current_user)
-    screen = screen_service.get_screen(db, screen_id)
+    screen = await run_db(db, screen_service.get_screen, screen_id)
     if not screen:
         raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Screen not found")
-    return screen_service.update_screen(db, screen, payload.name)
+    return await run_db(db, screen_service.update_screen, screen, payload.name)
 
 
 @router.delete("/{screen_id}", status_code=status.HTTP_204_NO_CONTENT)
-def delete(screen_id: int, db: Session = Depends(get_db), current_user=Depends(auth_service.get_current_user)):
+async def delete(screen_id: int, db: DbSession = Depends(get_session), current_user=Depends(auth_service.get_current_user)):
     auth_service.ensure_admin(current_user)
-    screen = screen_service.get_screen(db, screen_id)
+    screen = await run_db(db, screen_service.get_screen, screen_id)
     if not screen:
         raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Screen not found")
-    screen_service.delete_screen(db, screen)
+    await run_db(db, screen_service.delete_screen, screen)
     return None
@@ -1,65 +1,139 @@
-from datetime import datetime
+import json
+from datetime import datetime, timedelta
 
-from fastapi import APIRouter, Depends, HTTPException, status
-from sqlalchemy.orm import Session
+from fastapi import APIRouter, Depends, HTTPException, Query, Request, Response, status
+from fastapi.responses import StreamingResponse
 
-from app.core.database import get_db
-from app.schemas.schemas import ShowOut, ShowCreate, ShowUpdate
-from app.services import show_service, auth_service
+from app.core.database import DbSession, get_session, run_db, close_db
+from app.core.pagination import DEFAULT_LIMIT, MAX_LIMIT, page_response, set_next_cursor
+from app.core.pubsub import broker
+from app.core.responses import FastJSONResponse
+from app.schemas.schemas import ShowOut, ShowCreate, ShowUpdate, ShowBulkCreate, ShowBulkResult, SeatAvailability, ShowtimeCinema, ShowAttendee
+from app.services import show_service, booking_service, auth_service
 
 router = APIRouter()
 
 
 @router.get("/", response_model=list[ShowOut])
-def list_all(db: Session = Depends(get_db)):
-    return show_service.list_shows(db)
+async def list_all(
+    limit: int = Query(DEFAULT_LIMIT, ge=1, le=MAX_LIMIT),
+    cursor: str | None = None,
+    movie_id: int | None = None,
+    screen_id: int | None = None,
+    cinema_id: int | None = None,
+    start_from: datetime | None = None,
+    start_to: datetime | None = None,
+    db: DbSession = Depends(get_session),
+):
+    shows, next_cursor = await run_db(
+        db, show_service.read_shows, limit, cursor,
+        movie_id=movie_id, screen_id=screen_id, cinema_id=cinema_id, start_from=start_from, start_to=start_to,
+    )
+    return page_response(shows, next_cursor)
+
+
+@router.get("/showtimes", response_model=list[ShowtimeCinema])
+async def showtimes(
+    start_from: datetime | None = None,
+    days: int = Query(7, ge=1, le=31),
+    cinema_id: int | None = None,
+    movie_id: int | None = None,
+    db: DbSession = Depends(get_session),
+):
+    # Minute resolution so the default window is shared by everyone loading the page.
+    start_from = start_from or datetime.now().replace(second=0, microsecond=0)
+    cinemas = await run_db(db, show_service.read_showtimes, start_from, start_from + timedelta(days=days), cinema_id=cinema_id, movie_id=movie_id)
+    return FastJSONResponse(cinemas)
 
 
 @router.get("/{show_id}", response_model=ShowOut)
-def get_one(show_id: int, db: Session = Depends(get_db)):
-    show = show_service.get_show(db, show_id)
+async def get_one(show_id: int, db: DbSession = Depends(get_session)):
+    show = await run_db(db, show_service.read_show, show_id)
     if not show:
         raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Show not found")
     return show
 
 
+@router.get("/{show_id}/seats", response_model=SeatAvailability)
+async def get_seats(show_id: int, request: Request, response: Response, db: DbSession = Depends(get_session)):
+    availability = await run_db(db, booking_service.get_seat_availability, show_id)
+    etag = f'"{show_id}.{availability["version"]}"'
+    if_none_match = request.headers.get("if-none-match", "")
+    if if_none_match == "*" or etag in (tag.strip() for tag in if_none_match.split(",")):
+        return Response(status_code=status.HTTP_304_NOT_MODIFIED, headers={"ETag": etag})
+    response.headers["ETag"] = etag
+    return availability
+
+
+@router.get("/{show_id}/seats/stream")
+async def stream_seats(show_id: int, db: DbSession = Depends(get_session)):
+    # Subscribe before taking the snapshot so no delta can fall between the two.
+    subscription = broker.subscribe(booking_service.seat_channel(show_id))
+    try:
+        snapshot = await run_db(db, booking_service.get_seat_availability, show_id)
+    except HTTPException:
+        subscription.close()
+        raise
+    finally:
+        await close_db(db)
+
+    async def events():
+        try:
+            yield f"event: snapshot\ndata: {json.dumps(snapshot)}\n\n"
+            async for message in subscription.listen(heartbeat=15):
+                yield ": keepalive\n\n" if message is None else f"event: seats\ndata: {message}\n\n"
+        finally:
+            subscription.close()
+
+    return StreamingResponse(events(), media_type="text/event-stream", headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"})
+
+
 @router.post("/", response_model=ShowOut, status_code=status.HTTP_201_CREATED)
-def create(payload: ShowCreate, db: Session = Depends(get_db), current_user=Depends(auth_service.get_current_user)):
+async def create(payload: ShowCreate, db: DbSession = Depends(get_session), current_user=Depends(auth_service.get_current_user)):
+    auth_service.ensure_admin(current_user)
+    return await run_db(db, show_service.create_show, payload.movie_id, payload.screen_id, payload.start_time)
+
+
+@router.post("/bulk", response_model=ShowBulkResult)
+async def bulk_create(payload: ShowBulkCreate, db: DbSession = Depends(get_session), current_user=Depends(auth_service.get_current_user)):
     auth_service.ensure_admin(current_user)
-    return show_service.create_show(db, payload.movie_id, payload.screen_id, payload.start_time)
+    items = [s.model_dump() for s in payload.shows]
+    if payload.template is not None:
+        items += show_service.expand_template(payload.template)
+    if len(items) > 5000:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="At most 5000 shows per request")
+    return await run_db(db, show_service.bulk_create_shows, items)
 
 
 @router.put("/{show_id}", response_model=ShowOut)
-def update(show_id: int, payload: ShowUpdate, db: Session = Depends(get_db), current_user=Depends(auth_service.get_current_user)):
+async def update(show_id: int, payload: ShowUpdate, db: DbSession = Depends(get_session), current_user=Depends(auth_service.get_current_user)):
     auth_service.ensure_admin(current_user)
-    show = show_service.get_show(db, show_id)
+    show = await run_db(db, show_service.get_show, show_id)
     if not show:
         raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Show not found")
-    return show_service.update_show(db, show, payload.movie_id, payload.screen_id, payload.start_time)
+    return await run_db(db, show_service.update_show, show, payload.movie_id, payload.screen_id, payload.start_time)
 
 
 @router.delete("/{show_id}", status_code=status.HTTP_204_NO_CONTENT)
-def delete(show_id: int, db: Session = Depends(get_db), current_user=Depends(auth_service.get_current_user)):
+async def delete(show_id: int, db: DbSession = Depends(get_session), current_user=Depends(auth_service.get_current_user)):
     auth_service.ensure_admin(current_user)
-    show = show_service.get_show(db, show_id)
+    show = await run_db(db, show_service.get_show, show_id)
     if not show:
         raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Show not found")
-    show_service.delete_show(db, show)
+    await run_db(db, show_service.delete_show, show)
     return None
 
 
-@router.get("/{show_id}/bookings")
-def get_show_bookings(show_id: int, db: Session = Depends(get_db), current_user=Depends(auth_service.get_current_user)):
+@router.get("/{show_id}/bookings", response_model=list[ShowAttendee])
+async def get_show_bookings(
+    show_id: int,
+    response: Response,
+    limit: int = Query(DEFAULT_LIMIT, ge=1, le=MAX_LIMIT),
+    cursor: str | None = None,
+    db: DbSession = Depends(get_session),
+    current_user=Depends(auth_service.get_current_user),
+):
     auth_service.ensure_admin(current_user)
-    from app.models.models import Booking
-    bookings = db.query(Booking).filter(Booking.show_id == show_id).all()
-    return [
-        {
-            "seat": booking.seat,
-            "user": {
-                "name": booking.user.name,
-                "email": booking.user.email
-            }
-        }
-        for booking in bookings
-    ]
+    attendees, next_cursor = await run_db(db, booking_service.list_show_attendees, show_id, limit, cursor)
+    set_next_cursor(response, next_cursor)
+    return attendees
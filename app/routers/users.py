@@ -7,5 +7,5 @@ router = APIRouter()
 
 
 @router.get("/me", response_model=UserOut)
-def profile(current_user=Depends(auth_service.get_current_user)):
+async def profile(current_user=Depends(auth_service.get_current_user)):
     return current_user
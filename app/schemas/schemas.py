@@ -1,6 +1,6 @@
 from __future__ import annotations
-from datetime import datetime
-from typing import List, Optional
+from datetime import date, datetime, time
+from typing import List, Literal, Optional
 
 from pydantic import BaseModel, EmailStr, Field
 
@@ -84,6 +84,18 @@ class ScreenOut(BaseModel):
         from_attributes = True
 
 
+class ScreenLayoutIn(BaseModel):
+    seats: List[str] = Field(min_length=1, max_length=100)  # one string per row, "1" = seat, "0" = aisle/blocked
+
+
+class ScreenLayoutOut(BaseModel):
+    screen_id: int
+    rows: int
+    cols: int
+    capacity: int
+    seats: List[str]
+
+
 # Movie
 class MovieBase(BaseModel):
     title: str
@@ -131,12 +143,70 @@ class ShowOut(ShowBase):
         from_attributes = True
 
 
+class ShowScheduleTemplate(BaseModel):
+    movie_id: int
+    screen_ids: List[int] = Field(min_length=1)
+    start_date: date
+    end_date: date
+    times: List[time] = Field(min_length=1)
+
+
+class ShowBulkCreate(BaseModel):
+    shows: List[ShowCreate] = Field(default_factory=list, max_length=5000)
+    template: Optional[ShowScheduleTemplate] = None
+
+
+class ShowBulkItemResult(BaseModel):
+    index: int
+    status: Literal["created", "conflict", "invalid"]
+    movie_id: int
+    screen_id: int
+    start_time: datetime
+    show_id: Optional[int] = None
+    detail: Optional[str] = None
+
+
+class ShowBulkResult(BaseModel):
+    created: int
+    results: List[ShowBulkItemResult]
+
+
+class Showtime(BaseModel):
+    show_id: int
+    start_time: datetime
+    screen_id: int
+    screen_name: str
+
+
+class ShowtimeMovie(BaseModel):
+    id: int
+    title: str
+    duration: int
+    showtimes: List[Showtime]
+
+
+class ShowtimeCinema(BaseModel):
+    id: int
+    name: str
+    location: str
+    movies: List[ShowtimeMovie]
+
+
 # Booking
 class Seat(BaseModel):
     row: int
     col: int
 
 
+class SeatAvailability(BaseModel):
+    show_id: int
+    rows: int
+    cols: int
+    version: int
+    available: int
+    occupied: List[str]  # one string per row, "1" sold, "2" held, "-" no seat
+
+
 class BookingCreate(BaseModel):
     show_id: int
     seats: List[Seat] = Field(min_items=1, max_items=6)
@@ -151,3 +221,103 @@ class BookingOut(BaseModel):
 
     class Config:
         from_attributes = True
+
+
+class BookingHistoryItem(BookingOut):
+    show_start: datetime
+    movie_id: int
+    movie_title: str
+    cinema_name: str
+    screen_name: str
+
+
+class BestAvailableCreate(BaseModel):
+    show_id: int
+    quantity: int = Field(ge=1, le=6)
+    zone: Literal["front", "middle", "back"] = "middle"
+
+
+class HoldCreate(BookingCreate):
+    pass
+
+
+class HoldOut(BaseModel):
+    id: int
+    user_id: int
+    show_id: int
+    seats: List[Seat]
+    expires_at: datetime
+
+    class Config:
+        from_attributes = True
+
+
+class BookingBatchCreate(BaseModel):
+    items: List[BookingCreate] = Field(min_length=1, max_length=500)
+    atomic: bool = True
+
+
+class BookingBatchItemResult(BaseModel):
+    index: int
+    show_id: int
+    status: Literal["booked", "conflict", "invalid", "not_found", "aborted"]
+    booking: Optional[BookingOut] = None
+    detail: Optional[str] = None
+
+
+class BookingBatchResult(BaseModel):
+    atomic: bool
+    booked: int
+    results: List[BookingBatchItemResult]
+
+
+class AttendeeUser(BaseModel):
+    id: int
+    name: str
+    email: str
+
+
+class ShowAttendee(BaseModel):
+    booking_id: int
+    row: int
+    col: int
+    created_at: datetime
+    user: AttendeeUser
+
+
+# Analytics
+class SalesSummary(BaseModel):
+    key: str
+    label: str
+    shows: int
+    bookings: int
+    seats_sold: int
+    capacity: int
+    fill_rate: float
+
+
+# Profiling
+class ProfileStart(BaseModel):
+    mode: Literal["sampling", "deterministic"] = "sampling"
+    requests: int = Field(default=1, ge=1, le=10000)
+    path: Optional[str] = None  # only profile requests whose path starts with this
+    interval_ms: float = Field(default=5.0, ge=1.0, le=1000.0)  # sampling mode only
+
+
+class ProfileStatus(BaseModel):
+    mode: Literal["sampling", "deterministic"]
+    path: Optional[str]
+    requests: int
+    remaining: int
+    captured: int
+    samples: int
+    started_at: datetime
+    finished: bool
+    pid: int
+
+
+class HotFunction(BaseModel):
+    function: str
+    calls: Optional[int]  # deterministic mode only
+    self_seconds: float
+    total_seconds: float
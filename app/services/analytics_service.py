@@ -0,0 +1,78 @@
+from datetime import datetime
+
+from sqlalchemy import func, select
+from sqlalchemy.orm import Session
+
+from app.models.models import Cinema, Movie, Screen, ScreenLayout, Show, ShowSales
+from app.services.layout_service import DEFAULT_LAYOUT
+
+
+def _group_columns(group_by: str) -> tuple:
+    if group_by == "show":
+        return Show.id, func.min(Movie.title)
+    if group_by == "movie":
+        return Movie.id, Movie.title
+    if group_by == "cinema":
+        return Cinema.id, Cinema.name
+    day = func.date(Show.start_time)
+    return day, day
+
+
+def sales_summary(
+    db: Session,
+    group_by: str = "show",
+    start_from: datetime | None = None,
+    start_to: datetime | None = None,
+    cinema_id: int | None = None,
+    movie_id: int | None = None,
+) -> list[dict]:
+    # Reads the per-show counters in show_sales plus each screen's current layout capacity; the
+    # bookings table is never touched, so the cost follows the number of shows in the window.
+    current_layout = (
+        select(ScreenLayout.screen_id, func.max(ScreenLayout.id).label("layout_id"))
+        .group_by(ScreenLayout.screen_id)
+        .subquery()
+    )
+    key, label = _group_columns(group_by)
+    query = (
+        db.query(
+            key,
+            label,
+            func.count(Show.id),
+            func.coalesce(func.sum(ShowSales.bookings), 0),
+            func.coalesce(func.sum(ShowSales.seats_sold), 0),
+            func.sum(func.coalesce(ScreenLayout.capacity, DEFAULT_LAYOUT.capacity)),
+        )
+        .select_from(Show)
+        .join(Movie, Show.movie_id == Movie.id)
+        .join(Screen, Show.screen_id == Screen.id)
+        .join(Cinema, Screen.cinema_id == Cinema.id)
+        .outerjoin(ShowSales, ShowSales.show_id == Show.id)
+        .outerjoin(current_layout, current_layout.c.screen_id == Show.screen_id)
+        .outerjoin(ScreenLayout, ScreenLayout.id == current_layout.c.layout_id)
+    )
+    if start_from is not None:
+        query = query.filter(Show.start_time >= start_from)
+    if start_to is not None:
+        query = query.filter(Show.start_time < start_to)
+    if cinema_id is not None:
+        query = query.filter(Screen.cinema_id == cinema_id)
+    if movie_id is not None:
+        query = query.filter(Show.movie_id == movie_id)
+    if group_by in ("movie", "cinema"):
+        query = query.group_by(key, label)
+    else:
+        query = query.group_by(key)
+
+    return [
+        {
+            "key": str(group_key),
+            "label": str(group_label),
+            "shows": shows,
+            "bookings": bookings,
+            "seats_sold": seats_sold,
+            "capacity": capacity,
+            "fill_rate": round(seats_sold / capacity, 4) if capacity else 0.0,
+        }
+        for group_key, group_label, shows, bookings, seats_sold, capacity in query.order_by(key)
+    ]
@@ -1,43 +1,105 @@
-from datetime import timedelta
-from typing import Optional
+from dataclasses import dataclass
+from typing import Optional, Union
 
 from fastapi import Depends, HTTPException, status
 from fastapi.security import OAuth2PasswordBearer
 from jose import JWTError
 from sqlalchemy.orm import Session
 
-from app.core.database import get_db
-from app.core.security import hash_password, verify_password, create_access_token, decode_token
+from app.core.cache import cache
+from app.core.config import settings
+from app.core.database import DbSession, get_session, run_db
+from app.core.metrics import logins
+from app.core.security import HashingPoolBusy, hash_password_async, verify_and_update_password, create_access_token, decode_token
 from app.models.models import User
 
 oauth2_scheme = OAuth2PasswordBearer(tokenUrl="/api/auth/login")
 
 
-def register_user(db: Session, name: str, email: str, password: str) -> User:
-    existing = db.query(User).filter(User.email == email).first()
-    if existing:
+@dataclass(frozen=True)
+class TokenUser:
+    id: int
+    name: str
+    email: str
+    is_admin: int
+
+
+def _hashing_busy() -> HTTPException:
+    return HTTPException(
+        status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+        detail="Too many sign-ins in progress, retry shortly",
+        headers={"Retry-After": "1"},
+    )
+
+
+def _get_user_by_email(db: Session, email: str) -> Optional[User]:
+    return db.query(User).filter(User.email == email).first()
+
+
+def _create_user(db: Session, name: str, email: str, password_hash: str) -> User:
+    if _get_user_by_email(db, email):
         raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="Email already registered")
-    user = User(name=name, email=email, password=hash_password(password))
+    user = User(name=name, email=email, password=password_hash)
     db.add(user)
     db.commit()
     db.refresh(user)
     return user
 
 
-def authenticate_user(db: Session, email: str, password: str) -> Optional[User]:
-    user = db.query(User).filter(User.email == email).first()
+def _store_password_hash(db: Session, user: User, password_hash: str) -> None:
+    user.password = password_hash
+    db.commit()
+    db.refresh(user)
+
+
+async def register_user(db: DbSession, name: str, email: str, password: str) -> User:
+    try:
+        password_hash = await hash_password_async(password)
+    except HashingPoolBusy:
+        raise _hashing_busy()
+    return await run_db(db, _create_user, name, email, password_hash)
+
+
+async def authenticate_user(db: DbSession, email: str, password: str) -> Optional[User]:
+    user = await run_db(db, _get_user_by_email, email)
     if not user:
+        logins.inc("failure")
         return None
-    if not verify_password(password, user.password):
+    try:
+        valid, new_hash = await verify_and_update_password(password, user.password)
+    except HashingPoolBusy:
+        logins.inc("busy")
+        raise _hashing_busy()
+    if not valid:
+        logins.inc("failure")
         return None
+    logins.inc("success")
+    if new_hash:
+        # Hash cost settings changed since this password was stored.
+        await run_db(db, _store_password_hash, user, new_hash)
     return user
 
 
-def create_user_token(user_id: int) -> str:
-    return create_access_token(subject=str(user_id))
+def create_user_token(user: User) -> str:
+    claims = {"name": user.name, "email": user.email, "adm": user.is_admin, "ver": user.token_version}
+    return create_access_token(subject=str(user.id), extra_claims=claims)
+
+
+def _token_version_key(user_id: int) -> str:
+    return f"user_ver:{user_id}"
+
+
+def revoke_user_tokens(db: Session, user_id: int) -> None:
+    user = db.get(User, user_id)
+    if user is None:
+        return
+    user.token_version += 1
+    db.commit()
+    # Stateless checks only see this through the cache; tokens issued before it expire on their own.
+    cache.set(_token_version_key(user_id), str(user.token_version), settings.jwt_access_token_expire_minutes * 60)
 
 
-def get_current_user(db: Session = Depends(get_db), token: str = Depends(oauth2_scheme)) -> User:
+async def get_current_user(db: DbSession = Depends(get_session), token: str = Depends(oauth2_scheme)) -> Union[User, TokenUser]:
     credentials_exception = HTTPException(
         status_code=status.HTTP_401_UNAUTHORIZED,
         detail="Could not validate credentials",
@@ -50,12 +112,20 @@ def get_current_user(db: Session = Depends(get_db), token: str = Depends(oauth2_
             raise credentials_exception
     except JWTError:
         raise credentials_exception
-    user = db.get(User, int(sub))
-    if user is None:
+    version = payload.get("ver", 0)
+
+    if settings.jwt_stateless and "ver" in payload:
+        current = cache.get(_token_version_key(int(sub)))
+        if current is not None and int(current) != version:
+            raise credentials_exception
+        return TokenUser(id=int(sub), name=payload["name"], email=payload["email"], is_admin=payload["adm"])
+
+    user = await run_db(db, Session.get, User, int(sub))
+    if user is None or user.token_version != version:
         raise credentials_exception
     return user
 
 
-def ensure_admin(user: User) -> None:
+def ensure_admin(user: Union[User, TokenUser]) -> None:
     if not user.is_admin:
         raise HTTPException(status_code=status.HTTP_403_FORBIDDEN, detail="Admin privileges required")
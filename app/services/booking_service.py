@@ -1,64 +1,529 @@
 from __future__ import annotations
-from typing import List, Set, Tuple
+import json
+from collections import Counter
+from datetime import datetime
+from typing import Any, Iterable, List, Set, Tuple
 
 from fastapi import HTTPException, status
-from sqlalchemy.orm import Session
+from sqlalchemy import exists, func
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.orm import Session, selectinload
 
-from app.models.models import Booking, Show
+from app.core.cache import cache
+from app.core.config import settings
+from app.core.metrics import bookings_created, seat_conflicts
+from app.core.pagination import DEFAULT_LIMIT, paginate
+from app.core.pubsub import broker
+from app.models.models import Booking, BookingSeat, Cinema, Movie, Screen, SeatHold, Show, ShowSales, ShowSeatMap, User
+from app.schemas.schemas import BookingOut
+from app.services.layout_service import DEFAULT_LAYOUT, SeatLayout, show_layout, show_layouts
 
-TOTAL_ROWS = 10
-TOTAL_COLS = 10
+# Grid used for screens that have no layout of their own.
+TOTAL_ROWS = DEFAULT_LAYOUT.rows
+TOTAL_COLS = DEFAULT_LAYOUT.cols
 
 
 def _to_tuple(seat: dict) -> Tuple[int, int]:
     return (int(seat["row"]), int(seat["col"]))
 
 
-def _validate_seats(seats: List[dict]) -> None:
+def _validate_seats(seats: List[dict], layout: SeatLayout) -> None:
     unique: Set[Tuple[int, int]] = set()
     for seat in seats:
         r, c = _to_tuple(seat)
-        if not (0 <= r < TOTAL_ROWS and 0 <= c < TOTAL_COLS):
+        if not layout.has_seat(r, c):
+            if 0 <= r < layout.rows and 0 <= c < layout.cols:
+                raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="No seat at that position")
             raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="Seat out of range")
         if (r, c) in unique:
             raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="Duplicate seats not allowed")
         unique.add((r, c))
 
 
-def _load_booked(db: Session, show_id: int) -> Set[Tuple[int, int]]:
-    booked: Set[Tuple[int, int]] = set()
-    for b in db.query(Booking).filter(Booking.show_id == show_id).all():
-        for s in b.seats:
-            booked.add(_to_tuple(s))
-    return booked
+def _seat_index(seat: dict, layout: SeatLayout) -> int:
+    return layout.index(*_to_tuple(seat))
 
 
-def create_booking(db: Session, user_id: int, show_id: int, seats: List[dict]) -> Booking:
-    _validate_seats(seats)
-    show = db.get(Show, show_id)
-    if not show:
-        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Show not found")
+def _empty_bitmap(layout: SeatLayout) -> bytearray:
+    return bytearray(len(layout.seats))
+
+
+def _is_occupied(bitmap: bytes, index: int) -> bool:
+    return bool(bitmap[index >> 3] & (1 << (index & 7)))
+
+
+def _mark(bitmap: bytearray, indexes: Iterable[int], occupied: bool) -> None:
+    for index in indexes:
+        if occupied:
+            bitmap[index >> 3] |= 1 << (index & 7)
+        else:
+            bitmap[index >> 3] &= ~(1 << (index & 7)) & 0xFF
+
+
+def _held_bitmaps(db: Session, layouts: dict[int, SeatLayout]) -> dict[int, bytearray]:
+    # Expired holds are ignored here, so they stop blocking seats before the sweeper deletes them.
+    bitmaps = {show_id: _empty_bitmap(layout) for show_id, layout in layouts.items()}
+    query = db.query(SeatHold.show_id, SeatHold.seats).filter(SeatHold.show_id.in_(layouts), SeatHold.expires_at > datetime.utcnow())
+    for show_id, seats in query:
+        _mark(bitmaps[show_id], _indexes(seats, layouts[show_id]), True)
+    return bitmaps
+
+
+def _indexes(seats: Iterable[dict], layout: SeatLayout) -> List[int]:
+    # Layout changes and show moves refuse to drop sold or held seats, and writers recheck the layout under
+    # the seat map lock, so every seat passed here is on the layout. The filter only covers bookings left
+    # at dropped positions by layout changes made before those checks existed.
+    return [layout.index(r, c) for r, c in map(_to_tuple, seats) if layout.has_seat(r, c)]
+
+
+def _taken(seat_map: ShowSeatMap, held: bytes) -> bytearray:
+    return bytearray(a | b for a, b in zip(seat_map.occupied, held))
+
+
+def _claims(show_id: int, seats: List[dict]) -> List[BookingSeat]:
+    # Unique-index entries are taken in insert order; a fixed (row, col) order means two requests for
+    # overlapping seats wait on each other in the same order and one gets the IntegrityError (409)
+    # instead of both deadlocking.
+    return [BookingSeat(show_id=show_id, seat_row=r, seat_col=c) for r, c in sorted(map(_to_tuple, seats))]
+
+
+def _claimed_seats(booking: Booking) -> List[dict]:
+    # Bookings made before booking_seats existed only have the JSON copy until migrate_booking_seats runs.
+    if not booking.seat_claims:
+        return booking.seats
+    return [{"row": claim.seat_row, "col": claim.seat_col} for claim in booking.seat_claims]
+
+
+def rebuild_seat_map(db: Session, show_id: int, layout: SeatLayout) -> ShowSeatMap:
+    # Callers hold the seat map row lock (or are creating the row), so no booking commits between the
+    # recount and the write.
+    bitmap = _empty_bitmap(layout)
+    claims = db.query(BookingSeat.seat_row, BookingSeat.seat_col).filter(BookingSeat.show_id == show_id)
+    _mark(bitmap, [layout.index(r, c) for r, c in claims if layout.has_seat(r, c)], True)
+    unmigrated = db.query(Booking.seats).filter(
+        Booking.show_id == show_id, ~exists().where(BookingSeat.booking_id == Booking.id)
+    )
+    for (seats,) in unmigrated:
+        _mark(bitmap, _indexes(seats, layout), True)
+    _recount_sales(db, show_id, bitmap)
+
+    seat_map = db.get(ShowSeatMap, show_id)
+    if seat_map is None:
+        seat_map = ShowSeatMap(show_id=show_id, occupied=bytes(bitmap), version=0)
+        db.add(seat_map)
+    else:
+        seat_map.occupied = bytes(bitmap)
+        seat_map.version += 1
+    db.flush()
+    return seat_map
 
-    booked = _load_booked(db, show_id)
-    requested = {_to_tuple(s) for s in seats}
 
-    if booked.intersection(requested):
-        raise HTTPException(status_code=status.HTTP_409_CONFLICT, detail="Some seats already booked")
+def ensure_layout_keeps_seats(db: Session, shows: Any, layout: SeatLayout) -> None:
+    # shows is anything Column.in_ takes. A layout change or a move to another screen must keep every
+    # position that is sold or held on the shows it applies to.
+    in_use = {(r, c) for r, c in db.query(BookingSeat.seat_row, BookingSeat.seat_col).filter(BookingSeat.show_id.in_(shows)).distinct()}
+    unmigrated = db.query(Booking.seats).filter(Booking.show_id.in_(shows), ~exists().where(BookingSeat.booking_id == Booking.id))
+    held = db.query(SeatHold.seats).filter(SeatHold.show_id.in_(shows), SeatHold.expires_at > datetime.utcnow())
+    for (seats,) in [*unmigrated, *held]:
+        in_use.update(map(_to_tuple, seats))
+    removed = [seat for seat in in_use if not layout.has_seat(*seat)]
+    if removed:
+        db.rollback()
+        raise HTTPException(status_code=status.HTTP_409_CONFLICT, detail=f"Layout has no place for {len(removed)} sold or held seats")
 
-    booking = Booking(user_id=user_id, show_id=show_id, seats=seats)
+
+def _get_seat_map(db: Session, show_id: int, lock: bool = False) -> ShowSeatMap:
+    query = db.query(ShowSeatMap).filter(ShowSeatMap.show_id == show_id)
+    if lock:
+        query = query.with_for_update()
+    seat_map = query.first()
+    if seat_map is not None:
+        return seat_map
+    # First booking for a show built before seat maps existed: another worker may be doing the same.
+    # Layout changes and show moves lock the screen row and rebuild only the seat maps they can see, so a
+    # new one is built under a shared lock on that row, for the layout that is current under it.
+    screen_id = db.query(Show.screen_id).filter(Show.id == show_id).scalar()
+    db.query(Screen.id).filter(Screen.id == screen_id).with_for_update(read=True).scalar()
+    try:
+        with db.begin_nested():
+            return rebuild_seat_map(db, show_id, show_layout(db, show_id))
+    except IntegrityError:
+        return query.one()
+
+
+def _layout_changed() -> HTTPException:
+    return HTTPException(status_code=status.HTTP_409_CONFLICT, detail="Seat layout changed, choose seats again")
+
+
+def _ensure_layout(db: Session, show_id: int, layout: SeatLayout) -> None:
+    # Called with the seat map locked. Layout changes and show moves rebuild seat maps under that lock, so
+    # a request that resolved the layout before one of them committed must not write its bit positions.
+    if show_layout(db, show_id) != layout:
+        db.rollback()
+        raise _layout_changed()
+
+
+def _recount_sales(db: Session, show_id: int, occupied: bytes) -> None:
+    sales = db.get(ShowSales, show_id) or ShowSales(show_id=show_id)
+    sales.seats_sold = sum(bin(b).count("1") for b in occupied)
+    sales.bookings = db.query(func.count(Booking.id)).filter(Booking.show_id == show_id).scalar()
+    db.add(sales)
+
+
+def _record_sales(db: Session, seat_map: ShowSeatMap, seats: int, bookings: int) -> None:
+    # Called after seat_map.occupied is updated and while its row lock is held, which also serializes
+    # these increments. Seat maps built before show_sales existed get their row counted here instead.
+    updated = (
+        db.query(ShowSales)
+        .filter(ShowSales.show_id == seat_map.show_id)
+        .update({ShowSales.seats_sold: ShowSales.seats_sold + seats, ShowSales.bookings: ShowSales.bookings + bookings}, synchronize_session=False)
+    )
+    if not updated:
+        db.flush()
+        _recount_sales(db, seat_map.show_id, seat_map.occupied)
+
+
+def _seat_conflict() -> HTTPException:
+    seat_conflicts.inc()
+    return HTTPException(status_code=status.HTTP_409_CONFLICT, detail="Some seats already booked")
+
+
+def create_booking(db: Session, user_id: int, show_id: int, seats: List[dict]) -> Booking:
+    layout = show_layout(db, show_id)
+    _validate_seats(seats, layout)
+
+    seat_map = _get_seat_map(db, show_id)
+    requested = [_seat_index(s, layout) for s in seats]
+    taken = _taken(seat_map, _held_bitmaps(db, {show_id: layout})[show_id])
+    if any(_is_occupied(taken, i) for i in requested):
+        raise _seat_conflict()
+
+    # The unique (show_id, seat_row, seat_col) claims are what stop a double sale; bookings for
+    # other seats of the same show insert in parallel and only serialize on the bitmap write below.
+    booking = Booking(user_id=user_id, show_id=show_id, seats=seats, seat_claims=_claims(show_id, seats))
     db.add(booking)
+    try:
+        db.flush()
+    except IntegrityError:
+        db.rollback()
+        raise _seat_conflict()
+
+    db.refresh(seat_map, with_for_update=True)
+    _ensure_layout(db, show_id, layout)
+    taken = _taken(seat_map, _held_bitmaps(db, {show_id: layout})[show_id])
+    if any(_is_occupied(taken, i) for i in requested):
+        db.rollback()
+        raise _seat_conflict()
+    occupied = bytearray(seat_map.occupied)
+    _mark(occupied, requested, True)
+    seat_map.occupied = bytes(occupied)
+    seat_map.version += 1
+    version = seat_map.version
+    _record_sales(db, seat_map, len(requested), 1)
+
     db.commit()
+    bookings_created.inc("single")
+    invalidate_seat_availability(show_id)
+    publish_seat_event(show_id, version, booked=seats)
     db.refresh(booking)
     return booking
 
 
-def list_user_bookings(db: Session, user_id: int) -> list[Booking]:
-    return db.query(Booking).filter(Booking.user_id == user_id).order_by(Booking.created_at.desc()).all()
+def _load_seat_maps(db: Session, show_ids: Iterable[int], lock: bool = False) -> dict[int, ShowSeatMap]:
+    show_ids = sorted(show_ids)
+    query = db.query(ShowSeatMap).filter(ShowSeatMap.show_id.in_(show_ids)).order_by(ShowSeatMap.show_id)
+    if lock:
+        # Fixed lock order across shows so two batches touching the same shows cannot deadlock.
+        query = query.with_for_update().populate_existing()
+    seat_maps = {seat_map.show_id: seat_map for seat_map in query}
+    for show_id in show_ids:
+        if show_id not in seat_maps:
+            seat_maps[show_id] = _get_seat_map(db, show_id, lock=lock)
+    return seat_maps
+
+
+def _place(bitmaps: dict[int, bytearray], show_id: int, requested: List[int]) -> bool:
+    bitmap = bitmaps[show_id]
+    if any(_is_occupied(bitmap, i) for i in requested):
+        return False
+    _mark(bitmap, requested, True)
+    return True
+
+
+def create_bookings(db: Session, user_id: int, items: List[dict], atomic: bool = True) -> dict:
+    results = [{"index": i, "show_id": item["show_id"], "status": "booked", "booking": None, "detail": None} for i, item in enumerate(items)]
+
+    def fail(result: dict, outcome: str, detail: str) -> None:
+        result["status"], result["detail"] = outcome, detail
+
+    def abort() -> dict:
+        db.rollback()
+        for result in results:
+            if result["status"] == "booked":
+                fail(result, "aborted", "Another item in the batch failed")
+        return {"atomic": atomic, "booked": 0, "results": results}
+
+    layouts = show_layouts(db, {item["show_id"] for item in items})
+    for result, item in zip(results, items):
+        if item["show_id"] not in layouts:
+            fail(result, "not_found", "Show not found")
+            continue
+        try:
+            _validate_seats(item["seats"], layouts[item["show_id"]])
+        except HTTPException as exc:
+            fail(result, "invalid", exc.detail)
+    if atomic and any(r["status"] != "booked" for r in results):
+        return abort()
+
+    # Same order as create_booking: cheap unlocked precheck, insert the seat claims, then lock the
+    # bitmaps (one statement for every show in the batch) and confirm before committing.
+    live = [(r, item, _indexes(item["seats"], layouts[item["show_id"]])) for r, item in zip(results, items) if r["status"] == "booked"]
+    seat_maps = _load_seat_maps(db, layouts)
+    bitmaps = {show_id: _taken(seat_maps[show_id], held) for show_id, held in _held_bitmaps(db, layouts).items()}
+    placed = []
+    for result, item, requested in live:
+        booking = Booking(user_id=user_id, show_id=item["show_id"], seats=item["seats"], seat_claims=_claims(item["show_id"], item["seats"]))
+        claimed = _place(bitmaps, item["show_id"], requested)
+        if claimed:
+            # One savepoint per item even in atomic mode, so a collision is pinned on the item that
+            # hit it and the rest of an aborted batch is reported as aborted rather than conflicting.
+            try:
+                with db.begin_nested():
+                    db.add(booking)
+            except IntegrityError:
+                claimed = False
+        if not claimed:
+            fail(result, "conflict", "Some seats already booked")
+            if atomic:
+                return abort()
+            continue
+        placed.append((result, item, requested, booking))
+
+    placed_layouts = {item["show_id"]: layouts[item["show_id"]] for _, item, _, _ in placed}
+    seat_maps = _load_seat_maps(db, placed_layouts, lock=True)
+    changed = {show_id for show_id, layout in show_layouts(db, placed_layouts).items() if layout != placed_layouts[show_id]}
+    bitmaps = {show_id: bytearray(seat_map.occupied) for show_id, seat_map in seat_maps.items()}
+    taken = {show_id: _taken(seat_maps[show_id], held) for show_id, held in _held_bitmaps(db, placed_layouts).items()}
+    booked: dict[int, list] = {}
+    orders: Counter[int] = Counter()
+    for result, item, requested, booking in placed:
+        if item["show_id"] in changed:
+            fail(result, "conflict", _layout_changed().detail)
+        elif _place(taken, item["show_id"], requested):
+            _mark(bitmaps[item["show_id"]], requested, True)
+            booked.setdefault(item["show_id"], []).extend(item["seats"])
+            orders[item["show_id"]] += 1
+            continue
+        else:
+            fail(result, "conflict", "Some seats already booked")
+        if atomic:
+            return abort()
+        db.delete(booking)
+
+    versions = {}
+    for show_id, seats in booked.items():
+        seat_map = seat_maps[show_id]
+        seat_map.occupied = bytes(bitmaps[show_id])
+        seat_map.version += 1
+        versions[show_id] = seat_map.version
+        _record_sales(db, seat_map, len(seats), orders[show_id])
+    db.flush()
+    for result, _, _, booking in placed:
+        if result["status"] == "booked":
+            result["booking"] = BookingOut.model_validate(booking).model_dump(mode="json")
+    db.commit()
+    bookings_created.inc("batch", amount=sum(orders.values()))
+
+    for show_id, seats in booked.items():
+        invalidate_seat_availability(show_id)
+        publish_seat_event(show_id, versions[show_id], booked=seats)
+    return {"atomic": atomic, "booked": sum(r["status"] == "booked" for r in results), "results": results}
+
+
+ZONES = ("front", "middle", "back")
+BEST_AVAILABLE_ATTEMPTS = 3
+
+
+def _zone_row(layout: SeatLayout, zone: str) -> int:
+    return {"front": 0, "middle": layout.rows // 2, "back": layout.rows - 1}[zone]
+
+
+def _best_block(taken: bytes, layout: SeatLayout, quantity: int, zone: str) -> List[dict] | None:
+    # One pass per row from the right: run is the length of the free run starting at col, so every
+    # col with run >= quantity starts a block. Aisles and blocked positions end a run like a sold seat.
+    # Blocks closest to the zone row, then to the centre, win.
+    target_row = _zone_row(layout, zone)
+    best, best_score = None, None
+    for r in range(layout.rows):
+        run = 0
+        for c in range(layout.cols - 1, -1, -1):
+            i = r * layout.cols + c
+            run = 0 if _is_occupied(taken, i) or not _is_occupied(layout.seats, i) else run + 1
+            if run < quantity:
+                continue
+            score = (abs(r - target_row), abs(2 * c + quantity - layout.cols))
+            if best_score is None or score < best_score:
+                best, best_score = (r, c), score
+    if best is None:
+        return None
+    r, c = best
+    return [{"row": r, "col": col} for col in range(c, c + quantity)]
+
+
+def book_best_available(db: Session, user_id: int, show_id: int, quantity: int, zone: str = "middle") -> Booking:
+    for _ in range(BEST_AVAILABLE_ATTEMPTS):
+        layout = show_layout(db, show_id)
+        seat_map = _get_seat_map(db, show_id)
+        seats = _best_block(_taken(seat_map, _held_bitmaps(db, {show_id: layout})[show_id]), layout, quantity, zone)
+        if seats is None:
+            db.rollback()
+            raise HTTPException(status_code=status.HTTP_409_CONFLICT, detail="Not enough adjacent seats available")
+        try:
+            return create_booking(db, user_id, show_id, seats)
+        except HTTPException as exc:
+            # Someone took part of the block between reading the map and booking: pick again.
+            if exc.status_code != status.HTTP_409_CONFLICT:
+                raise
+    raise _seat_conflict()
+
+
+def _availability_key(show_id: int) -> str:
+    return f"seats:{show_id}"
+
+
+def invalidate_seat_availability(show_id: int) -> None:
+    cache.delete(_availability_key(show_id))
+
+
+def seat_channel(show_id: int) -> str:
+    return f"show:{show_id}:seats"
+
+
+def publish_seat_event(
+    show_id: int,
+    version: int,
+    booked: Iterable[dict] = (),
+    released: Iterable[dict] = (),
+    held: Iterable[dict] = (),
+) -> None:
+    event = {
+        "show_id": show_id,
+        "version": version,
+        "booked": [list(_to_tuple(s)) for s in booked],
+        "released": [list(_to_tuple(s)) for s in released],
+        "held": [list(_to_tuple(s)) for s in held],
+    }
+    broker.publish(seat_channel(show_id), json.dumps(event))
+
+
+def get_seat_availability(db: Session, show_id: int) -> dict:
+    cached = cache.get(_availability_key(show_id))
+    if cached is not None:
+        return json.loads(cached)
+    layout = show_layout(db, show_id)
+    seat_map = _get_seat_map(db, show_id)
+    held = _held_bitmaps(db, {show_id: layout})[show_id]
+    db.commit()
+
+    bitmap = seat_map.occupied
+
+    def state(index: int) -> str:
+        if not _is_occupied(layout.seats, index):
+            return "-"
+        if _is_occupied(bitmap, index):
+            return "1"
+        return "2" if _is_occupied(held, index) else "0"
+
+    occupied = ["".join(state(r * layout.cols + c) for c in range(layout.cols)) for r in range(layout.rows)]
+    availability = {
+        "show_id": show_id,
+        "rows": layout.rows,
+        "cols": layout.cols,
+        "version": seat_map.version,
+        "available": sum(row.count("0") for row in occupied),
+        "occupied": occupied,
+    }
+    cache.set(_availability_key(show_id), json.dumps(availability), settings.seat_map_cache_ttl_seconds)
+    return availability
+
+
+def list_show_attendees(db: Session, show_id: int, limit: int = DEFAULT_LIMIT, cursor: str | None = None) -> tuple[list[dict], str | None]:
+    if not db.get(Show, show_id):
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Show not found")
+    # One row per sold seat with its booking and user joined in, paged in seat order on uq_booking_seat.
+    query = (
+        db.query(BookingSeat.seat_row, BookingSeat.seat_col, Booking.id, Booking.created_at, User.id, User.name, User.email)
+        .join(Booking, Booking.id == BookingSeat.booking_id)
+        .join(User, User.id == Booking.user_id)
+        .filter(BookingSeat.show_id == show_id)
+    )
+    rows, next_cursor = paginate(query, [BookingSeat.seat_row, BookingSeat.seat_col], limit, cursor)
+    attendees = [
+        {
+            "booking_id": booking_id,
+            "row": row,
+            "col": col,
+            "created_at": created_at,
+            "user": {"id": user_id, "name": name, "email": email},
+        }
+        for row, col, booking_id, created_at, user_id, name, email in rows
+    ]
+    return attendees, next_cursor
+
+
+def list_user_bookings(
+    db: Session,
+    user_id: int,
+    limit: int = DEFAULT_LIMIT,
+    cursor: str | None = None,
+    when: str = "all",
+) -> tuple[list, str | None]:
+    # Newest first off ix_bookings_user_created, with the show, movie, cinema and screen joined in,
+    # so a page is one query whatever the user's history looks like.
+    query = (
+        db.query(
+            Booking.id,
+            Booking.user_id,
+            Booking.show_id,
+            Booking.seats,
+            Booking.created_at,
+            Show.start_time.label("show_start"),
+            Movie.id.label("movie_id"),
+            Movie.title.label("movie_title"),
+            Cinema.name.label("cinema_name"),
+            Screen.name.label("screen_name"),
+        )
+        .join(Show, Booking.show_id == Show.id)
+        .join(Movie, Show.movie_id == Movie.id)
+        .join(Screen, Show.screen_id == Screen.id)
+        .join(Cinema, Screen.cinema_id == Cinema.id)
+        .filter(Booking.user_id == user_id)
+    )
+    # Show start times are local wall-clock times, as in showtimes.
+    now = datetime.now()
+    if when == "upcoming":
+        query = query.filter(Show.start_time >= now)
+    elif when == "past":
+        query = query.filter(Show.start_time < now)
+    return paginate(query, [Booking.created_at, Booking.id], limit, cursor, descending=True)
 
 
 def cancel_booking(db: Session, user_id: int, booking_id: int) -> None:
-    booking = db.get(Booking, booking_id)
+    booking = db.get(Booking, booking_id, options=[selectinload(Booking.seat_claims)])
     if not booking or booking.user_id != user_id:
         raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Booking not found")
+    show_id, seats = booking.show_id, _claimed_seats(booking)
+    seat_map = _get_seat_map(db, show_id, lock=True)
+    # Resolved under the lock, so the bits cleared match the layout the seat map was built for.
+    layout = show_layout(db, show_id)
+    released = _indexes(seats, layout)
+    occupied = bytearray(seat_map.occupied)
+    _mark(occupied, released, False)
+    seat_map.occupied = bytes(occupied)
+    seat_map.version += 1
+    version = seat_map.version
     db.delete(booking)
+    _record_sales(db, seat_map, -len(released), -1)
     db.commit()
+    invalidate_seat_availability(show_id)
+    publish_seat_event(show_id, version, released=seats)
@@ -1,20 +1,45 @@
+from sqlalchemy.engine import Row
 from sqlalchemy.orm import Session
 
+from app.core.cache import invalidate_item, invalidate_lists, invalidate_namespace, read_through
+from app.core.pagination import DEFAULT_LIMIT, paginate, project
 from app.models.models import Cinema
+from app.schemas.schemas import CinemaOut
 
 
-def list_cinemas(db: Session) -> list[Cinema]:
-    return db.query(Cinema).all()
+def list_cinemas(db: Session, limit: int = DEFAULT_LIMIT, cursor: str | None = None, location: str | None = None) -> tuple[list[Row], str | None]:
+    query = project(db.query(Cinema), Cinema, CinemaOut)
+    if location:
+        query = query.filter(Cinema.location.ilike(f"%{location}%"))
+    return paginate(query, [Cinema.id], limit, cursor)
 
 
 def get_cinema(db: Session, cinema_id: int) -> Cinema | None:
     return db.get(Cinema, cinema_id)
 
 
+def read_cinemas(db: Session, limit: int = DEFAULT_LIMIT, cursor: str | None = None, location: str | None = None) -> tuple[list[dict], str | None]:
+    def load() -> dict:
+        cinemas, next_cursor = list_cinemas(db, limit, cursor, location)
+        return {"items": [row._asdict() for row in cinemas], "next_cursor": next_cursor}
+
+    page = read_through("cinemas", "list", (limit, cursor, location), load)
+    return page["items"], page["next_cursor"]
+
+
+def read_cinema(db: Session, cinema_id: int) -> dict | None:
+    def load() -> dict | None:
+        cinema = get_cinema(db, cinema_id)
+        return CinemaOut.model_validate(cinema).model_dump(mode="json") if cinema else None
+
+    return read_through("cinemas", "item", (cinema_id,), load)
+
+
 def create_cinema(db: Session, name: str, location: str) -> Cinema:
     cinema = Cinema(name=name, location=location)
     db.add(cinema)
     db.commit()
+    invalidate_lists("cinemas")
     db.refresh(cinema)
     return cinema
 
@@ -26,9 +51,15 @@ def update_cinema(db: Session, cinema: Cinema, name: str | None, location: str |
         cinema.location = location
     db.commit()
     db.refresh(cinema)
+    invalidate_item("cinemas", cinema.id)
+    invalidate_lists("cinemas", "showtimes")
     return cinema
 
 
 def delete_cinema(db: Session, cinema: Cinema) -> None:
+    cinema_id = cinema.id
     db.delete(cinema)
     db.commit()
+    invalidate_item("cinemas", cinema_id)
+    invalidate_lists("cinemas", "showtimes")
+    invalidate_namespace("screens", "shows")
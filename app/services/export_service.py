@@ -0,0 +1,104 @@
+from __future__ import annotations
+import csv
+import io
+import json
+from datetime import datetime
+from typing import Iterator
+
+from app.core.database import SessionLocal
+from app.models.models import Booking, Cinema, Movie, Screen, Show, User
+
+EXPORT_BATCH_SIZE = 1000
+FIELDS = (
+    "booking_id",
+    "created_at",
+    "user_id",
+    "user_name",
+    "user_email",
+    "show_id",
+    "show_start",
+    "movie_title",
+    "cinema_name",
+    "screen_name",
+    "seat_count",
+    "seats",
+)
+
+
+def _rows(
+    show_id: int | None,
+    cinema_id: int | None,
+    start_from: datetime | None,
+    start_to: datetime | None,
+) -> Iterator[list[tuple]]:
+    # Own session so the export outlives the request's. stream_results keeps a server-side cursor open and
+    # yield_per pulls it in fixed-size batches, so memory does not grow with the size of the export.
+    db = SessionLocal()
+    try:
+        query = (
+            db.query(
+                Booking.id,
+                Booking.created_at,
+                User.id,
+                User.name,
+                User.email,
+                Show.id,
+                Show.start_time,
+                Movie.title,
+                Cinema.name,
+                Screen.name,
+                Booking.seats,
+            )
+            .join(User, Booking.user_id == User.id)
+            .join(Show, Booking.show_id == Show.id)
+            .join(Movie, Show.movie_id == Movie.id)
+            .join(Screen, Show.screen_id == Screen.id)
+            .join(Cinema, Screen.cinema_id == Cinema.id)
+        )
+        if show_id is not None:
+            query = query.filter(Booking.show_id == show_id)
+        if cinema_id is not None:
+            query = query.filter(Screen.cinema_id == cinema_id)
+        if start_from is not None:
+            query = query.filter(Show.start_time >= start_from)
+        if start_to is not None:
+            query = query.filter(Show.start_time < start_to)
+        statement = query.order_by(Booking.id).statement.execution_options(stream_results=True, yield_per=EXPORT_BATCH_SIZE)
+        for batch in db.execute(statement).partitions():
+            yield batch
+    finally:
+        db.close()
+
+
+def _record(row: tuple) -> dict:
+    record = dict(zip(FIELDS, (*row[:10], len(row[10]), [[s["row"], s["col"]] for s in row[10]])))
+    record["created_at"] = record["created_at"].isoformat()
+    record["show_start"] = record["show_start"].isoformat()
+    return record
+
+
+def export_bookings(
+    fmt: str,
+    show_id: int | None = None,
+    cinema_id: int | None = None,
+    start_from: datetime | None = None,
+    start_to: datetime | None = None,
+) -> Iterator[str]:
+    batches = _rows(show_id, cinema_id, start_from, start_to)
+    if fmt == "ndjson":
+        for batch in batches:
+            yield "".join(json.dumps(_record(row), separators=(",", ":")) + "\n" for row in batch)
+        return
+
+    buffer = io.StringIO()
+    writer = csv.writer(buffer)
+    writer.writerow(FIELDS)
+    for batch in batches:
+        for row in batch:
+            record = _record(row)
+            record["seats"] = " ".join(f"{r}-{c}" for r, c in record["seats"])
+            writer.writerow(record.values())
+        yield buffer.getvalue()
+        buffer.seek(0)
+        buffer.truncate()
+    yield buffer.getvalue()
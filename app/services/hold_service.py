@@ -0,0 +1,186 @@
+from __future__ import annotations
+import asyncio
+import logging
+from datetime import datetime, timedelta
+from typing import List
+
+from fastapi import HTTPException, status
+from fastapi.concurrency import run_in_threadpool
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.orm import Session
+
+from app.core.config import settings
+from app.core.database import SessionLocal
+from app.core.metrics import bookings_created
+from app.models.models import Booking, SeatHold
+from app.services.booking_service import (
+    _claims,
+    _ensure_layout,
+    _get_seat_map,
+    _held_bitmaps,
+    _indexes,
+    _is_occupied,
+    _mark,
+    _record_sales,
+    _seat_conflict,
+    _seat_index,
+    _taken,
+    _to_tuple,
+    _validate_seats,
+    invalidate_seat_availability,
+    publish_seat_event,
+)
+from app.services.layout_service import show_layout
+
+logger = logging.getLogger(__name__)
+
+SWEEP_BATCH_SIZE = 1000
+
+
+def place_hold(db: Session, user_id: int, show_id: int, seats: List[dict]) -> SeatHold:
+    layout = show_layout(db, show_id)
+    _validate_seats(seats, layout)
+
+    # Holds have no per-seat unique claims, so every hold is placed under the show's seat map lock;
+    # create_booking checks active holds under the same lock.
+    seat_map = _get_seat_map(db, show_id, lock=True)
+    _ensure_layout(db, show_id, layout)
+    taken = _taken(seat_map, _held_bitmaps(db, {show_id: layout})[show_id])
+    if any(_is_occupied(taken, _seat_index(s, layout)) for s in seats):
+        db.rollback()
+        raise _seat_conflict()
+    hold = SeatHold(
+        user_id=user_id,
+        show_id=show_id,
+        seats=seats,
+        expires_at=datetime.utcnow() + timedelta(seconds=settings.seat_hold_ttl_seconds),
+    )
+    db.add(hold)
+    seat_map.version += 1
+    version = seat_map.version
+    db.commit()
+    invalidate_seat_availability(show_id)
+    publish_seat_event(show_id, version, held=seats)
+    db.refresh(hold)
+    return hold
+
+
+def _get_own_hold(db: Session, user_id: int, hold_id: int) -> SeatHold:
+    hold = db.get(SeatHold, hold_id)
+    if not hold or hold.user_id != user_id:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Hold not found")
+    return hold
+
+
+def _hold_expired() -> HTTPException:
+    return HTTPException(status_code=status.HTTP_410_GONE, detail="Hold expired")
+
+
+def confirm_hold(db: Session, user_id: int, hold_id: int) -> Booking:
+    hold = _get_own_hold(db, user_id, hold_id)
+    if hold.expires_at <= datetime.utcnow():
+        raise _hold_expired()
+    show_id, seats = hold.show_id, hold.seats
+    layout = show_layout(db, show_id)
+    seat_map = _get_seat_map(db, show_id)
+
+    # Same order as create_booking: insert the seat claims, then take the seat map lock. Deleting the
+    # hold waits until after the lock too, as the sweeper locks the seat map before deleting holds.
+    booking = Booking(user_id=user_id, show_id=show_id, seats=seats, seat_claims=_claims(show_id, seats))
+    db.add(booking)
+    try:
+        db.flush()
+    except IntegrityError:
+        db.rollback()
+        raise _seat_conflict()
+
+    db.refresh(seat_map, with_for_update=True)
+    _ensure_layout(db, show_id, layout)
+    # Re-read under the lock: the sweeper may have removed the hold since it was loaded.
+    hold = db.query(SeatHold).filter(SeatHold.id == hold_id).populate_existing().first()
+    if hold is None or hold.expires_at <= datetime.utcnow():
+        db.rollback()
+        raise _hold_expired()
+    booked = _indexes(seats, layout)
+    if any(_is_occupied(seat_map.occupied, i) for i in booked):
+        db.rollback()
+        raise _seat_conflict()
+    db.delete(hold)
+    occupied = bytearray(seat_map.occupied)
+    _mark(occupied, booked, True)
+    seat_map.occupied = bytes(occupied)
+    seat_map.version += 1
+    version = seat_map.version
+    _record_sales(db, seat_map, len(booked), 1)
+
+    db.commit()
+    bookings_created.inc("hold")
+    invalidate_seat_availability(show_id)
+    publish_seat_event(show_id, version, booked=seats)
+    db.refresh(booking)
+    return booking
+
+
+def release_hold(db: Session, user_id: int, hold_id: int) -> None:
+    hold = _get_own_hold(db, user_id, hold_id)
+    show_id, seats = hold.show_id, hold.seats
+    seat_map = _get_seat_map(db, show_id, lock=True)
+    if not db.query(SeatHold).filter(SeatHold.id == hold_id).delete(synchronize_session=False):
+        db.rollback()
+        return
+    seat_map.version += 1
+    version = seat_map.version
+    db.commit()
+    invalidate_seat_availability(show_id)
+    publish_seat_event(show_id, version, released=seats)
+
+
+def sweep_expired_holds(db: Session, limit: int = SWEEP_BATCH_SIZE) -> int:
+    # Walks the expires_at index from the oldest entry, so the cost tracks the number of holds that
+    # expired since the last sweep rather than the size of the table.
+    now = datetime.utcnow()
+    show_ids = {
+        show_id
+        for (show_id,) in db.query(SeatHold.show_id).filter(SeatHold.expires_at <= now).order_by(SeatHold.expires_at).limit(limit)
+    }
+    events = []
+    swept = 0
+    for show_id in sorted(show_ids):
+        seat_map = _get_seat_map(db, show_id, lock=True)
+        layout = show_layout(db, show_id)
+        expired = db.query(SeatHold).filter(SeatHold.show_id == show_id, SeatHold.expires_at <= now).all()
+        if not expired:
+            continue
+        # A lapsed seat may already be sold or held again; clients only hear about seats that are free now.
+        taken = _taken(seat_map, _held_bitmaps(db, {show_id: layout})[show_id])
+        released = [
+            s for hold in expired for s in hold.seats
+            if layout.has_seat(*_to_tuple(s)) and not _is_occupied(taken, _seat_index(s, layout))
+        ]
+        db.query(SeatHold).filter(SeatHold.id.in_([hold.id for hold in expired])).delete(synchronize_session=False)
+        seat_map.version += 1
+        events.append((show_id, seat_map.version, released))
+        swept += len(expired)
+    db.commit()
+    for show_id, version, released in events:
+        invalidate_seat_availability(show_id)
+        publish_seat_event(show_id, version, released=released)
+    return swept
+
+
+def _sweep_once() -> int:
+    db = SessionLocal()
+    try:
+        return sweep_expired_holds(db)
+    finally:
+        db.close()
+
+
+async def run_hold_sweeper() -> None:
+    while True:
+        try:
+            while await run_in_threadpool(_sweep_once) >= SWEEP_BATCH_SIZE:
+                pass
+        except Exception:  # noqa: BLE001 - keep sweeping after a transient database error
+            logger.exception("Seat hold sweep failed")
+        await asyncio.sleep(settings.seat_hold_sweep_interval_seconds)
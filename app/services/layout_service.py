@@ -0,0 +1,100 @@
+from __future__ import annotations
+import threading
+from dataclasses import dataclass, field
+from typing import Iterable, List, Optional
+
+from fastapi import HTTPException, status
+from sqlalchemy import func, select
+from sqlalchemy.orm import Session
+
+from app.models.models import ScreenLayout, Show
+
+DEFAULT_ROWS = 10
+DEFAULT_COLS = 10
+
+
+@dataclass(frozen=True)
+class SeatLayout:
+    rows: int
+    cols: int
+    seats: bytes  # one bit per position, row-major; set = seat exists
+    capacity: int = field(init=False)
+
+    def __post_init__(self) -> None:
+        object.__setattr__(self, "capacity", sum(bin(b).count("1") for b in self.seats))
+
+    @classmethod
+    def full(cls, rows: int, cols: int) -> "SeatLayout":
+        bits = bytearray((rows * cols + 7) // 8)
+        for i in range(rows * cols):
+            bits[i >> 3] |= 1 << (i & 7)
+        return cls(rows, cols, bytes(bits))
+
+    @classmethod
+    def from_rows(cls, rows: List[str]) -> "SeatLayout":
+        cols = len(rows[0])
+        bits = bytearray((len(rows) * cols + 7) // 8)
+        for r, line in enumerate(rows):
+            for c, ch in enumerate(line):
+                if ch == "1":
+                    i = r * cols + c
+                    bits[i >> 3] |= 1 << (i & 7)
+        return cls(len(rows), cols, bytes(bits))
+
+    def index(self, row: int, col: int) -> int:
+        return row * self.cols + col
+
+    def has_seat(self, row: int, col: int) -> bool:
+        if not (0 <= row < self.rows and 0 <= col < self.cols):
+            return False
+        i = row * self.cols + col
+        return bool(self.seats[i >> 3] & (1 << (i & 7)))
+
+    def to_rows(self) -> List[str]:
+        return ["".join("1" if self.has_seat(r, c) else "0" for c in range(self.cols)) for r in range(self.rows)]
+
+
+DEFAULT_LAYOUT = SeatLayout.full(DEFAULT_ROWS, DEFAULT_COLS)
+
+# Layout rows are never updated in place, so a layout loaded once by id stays valid for the life of the process.
+_layouts: dict[int, SeatLayout] = {}
+_lock = threading.Lock()
+
+
+def _current_layout_id():
+    return (
+        select(func.max(ScreenLayout.id))
+        .where(ScreenLayout.screen_id == Show.screen_id)
+        .correlate(Show)
+        .scalar_subquery()
+    )
+
+
+def get_layout(db: Session, layout_id: Optional[int]) -> SeatLayout:
+    if layout_id is None:
+        return DEFAULT_LAYOUT
+    layout = _layouts.get(layout_id)
+    if layout is None:
+        row = db.get(ScreenLayout, layout_id)
+        layout = SeatLayout(row.rows, row.cols, bytes(row.seats))
+        with _lock:
+            _layouts[layout_id] = layout
+    return layout
+
+
+def screen_layout(db: Session, screen_id: int) -> SeatLayout:
+    layout_id = db.query(func.max(ScreenLayout.id)).filter(ScreenLayout.screen_id == screen_id).scalar()
+    return get_layout(db, layout_id)
+
+
+def show_layout(db: Session, show_id: int) -> SeatLayout:
+    # Show existence and its screen's current layout id in one round trip.
+    row = db.query(Show.id, _current_layout_id()).filter(Show.id == show_id).first()
+    if row is None:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Show not found")
+    return get_layout(db, row[1])
+
+
+def show_layouts(db: Session, show_ids: Iterable[int]) -> dict[int, SeatLayout]:
+    rows = db.query(Show.id, _current_layout_id()).filter(Show.id.in_(set(show_ids))).all()
+    return {show_id: get_layout(db, layout_id) for show_id, layout_id in rows}
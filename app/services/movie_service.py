@@ -1,20 +1,45 @@
+from sqlalchemy.engine import Row
 from sqlalchemy.orm import Session
 
+from app.core.cache import invalidate_item, invalidate_lists, invalidate_namespace, read_through
+from app.core.pagination import DEFAULT_LIMIT, paginate, project
 from app.models.models import Movie
+from app.schemas.schemas import MovieOut
 
 
-def list_movies(db: Session) -> list[Movie]:
-    return db.query(Movie).all()
+def list_movies(db: Session, limit: int = DEFAULT_LIMIT, cursor: str | None = None, title: str | None = None) -> tuple[list[Row], str | None]:
+    query = project(db.query(Movie), Movie, MovieOut)
+    if title:
+        query = query.filter(Movie.title.ilike(f"%{title}%"))
+    return paginate(query, [Movie.id], limit, cursor)
 
 
 def get_movie(db: Session, movie_id: int) -> Movie | None:
     return db.get(Movie, movie_id)
 
 
+def read_movies(db: Session, limit: int = DEFAULT_LIMIT, cursor: str | None = None, title: str | None = None) -> tuple[list[dict], str | None]:
+    def load() -> dict:
+        movies, next_cursor = list_movies(db, limit, cursor, title)
+        return {"items": [row._asdict() for row in movies], "next_cursor": next_cursor}
+
+    page = read_through("movies", "list", (limit, cursor, title), load)
+    return page["items"], page["next_cursor"]
+
+
+def read_movie(db: Session, movie_id: int) -> dict | None:
+    def load() -> dict | None:
+        movie = get_movie(db, movie_id)
+        return MovieOut.model_validate(movie).model_dump(mode="json") if movie else None
+
+    return read_through("movies", "item", (movie_id,), load)
+
+
 def create_movie(db: Session, title: str, description: str, duration: int) -> Movie:
     movie = Movie(title=title, description=description, duration=duration)
     db.add(movie)
     db.commit()
+    invalidate_lists("movies")
     db.refresh(movie)
     return movie
 
@@ -28,9 +53,15 @@ def update_movie(db: Session, movie: Movie, title: str | None, description: str
         movie.duration = duration
     db.commit()
     db.refresh(movie)
+    invalidate_item("movies", movie.id)
+    invalidate_lists("movies", "showtimes")
     return movie
 
 
 def delete_movie(db: Session, movie: Movie) -> None:
+    movie_id = movie.id
     db.delete(movie)
     db.commit()
+    invalidate_item("movies", movie_id)
+    invalidate_lists("movies", "showtimes")
+    invalidate_namespace("shows")
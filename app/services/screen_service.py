@@ -1,20 +1,52 @@
+from typing import List
+
+from fastapi import HTTPException, status
+from sqlalchemy.engine import Row
 from sqlalchemy.orm import Session
 
-from app.models.models import Screen
+from app.core.cache import invalidate_item, invalidate_lists, invalidate_namespace, read_through
+from app.core.pagination import DEFAULT_LIMIT, paginate, project
+from app.models.models import Screen, ScreenLayout, Show, ShowSeatMap
+from app.schemas.schemas import ScreenOut
+from app.services.booking_service import ensure_layout_keeps_seats, invalidate_seat_availability, rebuild_seat_map
+from app.services.layout_service import SeatLayout, get_layout, screen_layout
+
+MAX_LAYOUT_COLS = 100
 
 
-def list_screens(db: Session) -> list[Screen]:
-    return db.query(Screen).all()
+def list_screens(db: Session, limit: int = DEFAULT_LIMIT, cursor: str | None = None, cinema_id: int | None = None) -> tuple[list[Row], str | None]:
+    query = project(db.query(Screen), Screen, ScreenOut)
+    if cinema_id is not None:
+        query = query.filter(Screen.cinema_id == cinema_id)
+    return paginate(query, [Screen.id], limit, cursor)
 
 
 def get_screen(db: Session, screen_id: int) -> Screen | None:
     return db.get(Screen, screen_id)
 
 
+def read_screens(db: Session, limit: int = DEFAULT_LIMIT, cursor: str | None = None, cinema_id: int | None = None) -> tuple[list[dict], str | None]:
+    def load() -> dict:
+        screens, next_cursor = list_screens(db, limit, cursor, cinema_id)
+        return {"items": [row._asdict() for row in screens], "next_cursor": next_cursor}
+
+    page = read_through("screens", "list", (limit, cursor, cinema_id), load)
+    return page["items"], page["next_cursor"]
+
+
+def read_screen(db: Session, screen_id: int) -> dict | None:
+    def load() -> dict | None:
+        screen = get_screen(db, screen_id)
+        return ScreenOut.model_validate(screen).model_dump(mode="json") if screen else None
+
+    return read_through("screens", "item", (screen_id,), load)
+
+
 def create_screen(db: Session, cinema_id: int, name: str) -> Screen:
     screen = Screen(cinema_id=cinema_id, name=name)
     db.add(screen)
     db.commit()
+    invalidate_lists("screens")
     db.refresh(screen)
     return screen
 
@@ -24,9 +56,62 @@ def update_screen(db: Session, screen: Screen, name: str | None) -> Screen:
         screen.name = name
     db.commit()
     db.refresh(screen)
+    invalidate_item("screens", screen.id)
+    invalidate_lists("screens", "showtimes")
     return screen
 
 
 def delete_screen(db: Session, screen: Screen) -> None:
+    screen_id = screen.id
     db.delete(screen)
     db.commit()
+    invalidate_item("screens", screen_id)
+    invalidate_lists("screens", "showtimes")
+    invalidate_namespace("shows")
+
+
+def _layout_out(screen_id: int, layout: SeatLayout) -> dict:
+    return {"screen_id": screen_id, "rows": layout.rows, "cols": layout.cols, "capacity": layout.capacity, "seats": layout.to_rows()}
+
+
+def get_screen_layout(db: Session, screen: Screen) -> dict:
+    return _layout_out(screen.id, screen_layout(db, screen.id))
+
+
+def set_screen_layout(db: Session, screen: Screen, seats: List[str]) -> dict:
+    cols = len(seats[0])
+    if not 0 < cols <= MAX_LAYOUT_COLS or any(len(row) != cols for row in seats):
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=f"Layout rows must all have the same length (1-{MAX_LAYOUT_COLS})")
+    if any(ch not in "01" for row in seats for ch in row) or "1" not in "".join(seats):
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail='Layout rows use "1" for a seat and "0" for no seat')
+
+    layout = SeatLayout.from_rows(seats)
+    # The screen row lock serializes this with show moves onto the screen and with first bookings of its
+    # shows (_get_seat_map builds a missing seat map under a shared lock on it).
+    db.query(Screen.id).filter(Screen.id == screen.id).with_for_update().scalar()
+    # Seat bit positions depend on the grid width, so seat maps already built for this screen are redone.
+    # Their locks are taken first, in show_id order like every other multi-show writer, so no booking or
+    # hold for the screen lands between the check below and the rebuild.
+    shows = db.query(Show.id).filter(Show.screen_id == screen.id).scalar_subquery()
+    seat_maps = (
+        db.query(ShowSeatMap)
+        .filter(ShowSeatMap.show_id.in_(shows))
+        .order_by(ShowSeatMap.show_id)
+        .with_for_update()
+        .populate_existing()
+        .all()
+    )
+    ensure_layout_keeps_seats(db, shows, layout)
+
+    row = ScreenLayout(screen_id=screen.id, rows=layout.rows, cols=layout.cols, seats=layout.seats, capacity=layout.capacity)
+    db.add(row)
+    db.flush()
+    layout = get_layout(db, row.id)
+    show_ids = [seat_map.show_id for seat_map in seat_maps]
+    for show_id in show_ids:
+        rebuild_seat_map(db, show_id, layout)
+    screen_id = screen.id
+    db.commit()
+    for show_id in show_ids:
+        invalidate_seat_availability(show_id)
+    return _layout_out(screen_id, layout)
@@ -1,36 +1,301 @@
+from bisect import bisect_left, bisect_right
+from datetime import datetime, timedelta, timezone
+
+from fastapi import HTTPException, status
+from sqlalchemy import func, insert
+from sqlalchemy.engine import Row
+from sqlalchemy.exc import IntegrityError
 from sqlalchemy.orm import Session
 
-from app.models.models import Show
+from app.core.cache import invalidate_item, invalidate_lists, read_through
+from app.core.config import settings
+from app.core.pagination import DEFAULT_LIMIT, paginate, project
+from app.models.models import Cinema, Movie, Screen, Show, ShowSeatMap
+from app.schemas.schemas import ShowOut, ShowScheduleTemplate
+from app.services.booking_service import ensure_layout_keeps_seats, invalidate_seat_availability, rebuild_seat_map
+from app.services.layout_service import screen_layout
+
+
+def list_shows(
+    db: Session,
+    limit: int = DEFAULT_LIMIT,
+    cursor: str | None = None,
+    movie_id: int | None = None,
+    screen_id: int | None = None,
+    cinema_id: int | None = None,
+    start_from: datetime | None = None,
+    start_to: datetime | None = None,
+) -> tuple[list[Row], str | None]:
+    query = project(db.query(Show), Show, ShowOut)
+    if movie_id is not None:
+        query = query.filter(Show.movie_id == movie_id)
+    if screen_id is not None:
+        query = query.filter(Show.screen_id == screen_id)
+    if cinema_id is not None:
+        query = query.join(Screen, Show.screen_id == Screen.id).filter(Screen.cinema_id == cinema_id)
+    if start_from is not None:
+        query = query.filter(Show.start_time >= start_from)
+    if start_to is not None:
+        query = query.filter(Show.start_time < start_to)
+    return paginate(query, [Show.start_time, Show.id], limit, cursor)
+
 
+def list_showtimes(
+    db: Session,
+    start_from: datetime,
+    start_to: datetime,
+    cinema_id: int | None = None,
+    movie_id: int | None = None,
+) -> list[dict]:
+    query = (
+        db.query(
+            Show.id.label("show_id"), Show.start_time,
+            Movie.id.label("movie_id"), Movie.title, Movie.duration,
+            Screen.id.label("screen_id"), Screen.name.label("screen_name"),
+            Cinema.id.label("cinema_id"), Cinema.name.label("cinema_name"), Cinema.location,
+        )
+        .join(Movie, Show.movie_id == Movie.id)
+        .join(Screen, Show.screen_id == Screen.id)
+        .join(Cinema, Screen.cinema_id == Cinema.id)
+        .filter(Show.start_time >= start_from, Show.start_time < start_to)
+    )
+    if cinema_id is not None:
+        query = query.filter(Screen.cinema_id == cinema_id)
+    if movie_id is not None:
+        query = query.filter(Show.movie_id == movie_id)
 
-def list_shows(db: Session) -> list[Show]:
-    return db.query(Show).all()
+    cinemas: dict[int, dict] = {}
+    for row in query.order_by(Cinema.name, Cinema.id, Movie.title, Movie.id, Show.start_time):
+        cinema = cinemas.get(row.cinema_id)
+        if cinema is None:
+            cinema = cinemas[row.cinema_id] = {"id": row.cinema_id, "name": row.cinema_name, "location": row.location, "movies": {}}
+        movie = cinema["movies"].get(row.movie_id)
+        if movie is None:
+            movie = cinema["movies"][row.movie_id] = {"id": row.movie_id, "title": row.title, "duration": row.duration, "showtimes": []}
+        movie["showtimes"].append(
+            {"show_id": row.show_id, "start_time": row.start_time, "screen_id": row.screen_id, "screen_name": row.screen_name}
+        )
+    return [{**cinema, "movies": list(cinema["movies"].values())} for cinema in cinemas.values()]
 
 
 def get_show(db: Session, show_id: int) -> Show | None:
     return db.get(Show, show_id)
 
 
+def read_shows(db: Session, limit: int = DEFAULT_LIMIT, cursor: str | None = None, **filters) -> tuple[list[dict], str | None]:
+    def load() -> dict:
+        shows, next_cursor = list_shows(db, limit, cursor, **filters)
+        return {"items": [row._asdict() for row in shows], "next_cursor": next_cursor}
+
+    page = read_through("shows", "list", (limit, cursor, *sorted(filters.items())), load)
+    return page["items"], page["next_cursor"]
+
+
+def read_show(db: Session, show_id: int) -> dict | None:
+    def load() -> dict | None:
+        show = get_show(db, show_id)
+        return ShowOut.model_validate(show).model_dump(mode="json") if show else None
+
+    return read_through("shows", "item", (show_id,), load)
+
+
+def read_showtimes(db: Session, start_from: datetime, start_to: datetime, cinema_id: int | None = None, movie_id: int | None = None) -> list[dict]:
+    # list_showtimes already builds the ShowtimeCinema shape, so it is cached and served as is.
+    def load() -> list[dict]:
+        return list_showtimes(db, start_from, start_to, cinema_id=cinema_id, movie_id=movie_id)
+
+    return read_through("showtimes", "list", (start_from.isoformat(), start_to.isoformat(), cinema_id, movie_id), load)
+
+
+def _as_naive(start_time: datetime) -> datetime:
+    # Show.start_time is a naive DateTime; aware inputs are stored as UTC wall time.
+    if start_time.tzinfo is not None:
+        return start_time.astimezone(timezone.utc).replace(tzinfo=None)
+    return start_time
+
+
+def _screen_busy_until(start: datetime, duration: int) -> datetime:
+    return start + timedelta(minutes=duration + settings.show_cleaning_buffer_minutes)
+
+
+class _ScreenSchedule:
+    # Intervals on one screen sorted by start. A lookup only visits intervals starting within
+    # the longest interval's length before the probe, so it stays O(log n + overlaps).
+    def __init__(self) -> None:
+        self._starts: list[datetime] = []
+        self._intervals: list[tuple[datetime, datetime, int | None]] = []
+        self._longest = timedelta(0)
+
+    def add(self, start: datetime, end: datetime, show_id: int | None = None) -> None:
+        i = bisect_right(self._starts, start)
+        self._starts.insert(i, start)
+        self._intervals.insert(i, (start, end, show_id))
+        self._longest = max(self._longest, end - start)
+
+    def conflict(self, start: datetime, end: datetime) -> tuple[datetime, datetime, int | None] | None:
+        lo = bisect_left(self._starts, start - self._longest)
+        hi = bisect_left(self._starts, end)
+        for interval in self._intervals[lo:hi]:
+            if interval[1] > start:
+                return interval
+        return None
+
+
+def _load_schedules(
+    db: Session,
+    screen_ids: set[int],
+    window_start: datetime,
+    window_end: datetime,
+    exclude_show_id: int | None = None,
+) -> dict[int, _ScreenSchedule]:
+    # Only shows that can still be running at window_start matter, so the lower bound backs off by the
+    # longest movie; the scan is a range over uq_show_screen_time (screen_id, start_time), not the history.
+    longest = db.query(func.max(Movie.duration)).scalar() or 0
+    query = (
+        db.query(Show.id, Show.screen_id, Show.start_time, Movie.duration)
+        .join(Movie, Show.movie_id == Movie.id)
+        .filter(
+            Show.screen_id.in_(screen_ids),
+            Show.start_time > window_start - timedelta(minutes=longest + settings.show_cleaning_buffer_minutes),
+            Show.start_time < window_end,
+        )
+    )
+    if exclude_show_id is not None:
+        query = query.filter(Show.id != exclude_show_id)
+    schedules = {screen_id: _ScreenSchedule() for screen_id in screen_ids}
+    for show_id, screen_id, start, duration in query:
+        schedules[screen_id].add(start, _screen_busy_until(start, duration), show_id)
+    return schedules
+
+
+def _check_screen_free(db: Session, movie_id: int, screen_id: int, start_time: datetime, exclude_show_id: int | None = None) -> None:
+    duration = db.query(Movie.duration).filter(Movie.id == movie_id).scalar()
+    if duration is None:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Movie not found")
+    # Locking the screen row serializes scheduling on that screen, so two admins cannot both pass the check.
+    if db.query(Screen.id).filter(Screen.id == screen_id).with_for_update().scalar() is None:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Screen not found")
+    end = _screen_busy_until(start_time, duration)
+    clash = _load_schedules(db, {screen_id}, start_time, end, exclude_show_id)[screen_id].conflict(start_time, end)
+    if clash is not None:
+        raise HTTPException(status_code=status.HTTP_409_CONFLICT, detail=f"Screen is busy with show {clash[2]}")
+
+
 def create_show(db: Session, movie_id: int, screen_id: int, start_time) -> Show:
+    start_time = _as_naive(start_time)
+    _check_screen_free(db, movie_id, screen_id, start_time)
     show = Show(movie_id=movie_id, screen_id=screen_id, start_time=start_time)
     db.add(show)
     db.commit()
+    invalidate_lists("shows", "showtimes")
     db.refresh(show)
     return show
 
 
 def update_show(db: Session, show: Show, movie_id: int | None, screen_id: int | None, start_time) -> Show:
+    moved_from = show.screen_id if screen_id is not None and screen_id != show.screen_id else None
     if movie_id is not None:
         show.movie_id = movie_id
     if screen_id is not None:
         show.screen_id = screen_id
     if start_time is not None:
-        show.start_time = start_time
+        show.start_time = _as_naive(start_time)
+    if moved_from is not None:
+        # Both screen rows, in id order: a layout change on either one, or a first booking building the
+        # show's seat map, waits for the move (see set_screen_layout and booking_service._get_seat_map).
+        db.query(Screen.id).filter(Screen.id.in_([moved_from, screen_id])).order_by(Screen.id).with_for_update().all()
+    if movie_id is not None or screen_id is not None or start_time is not None:
+        with db.no_autoflush:
+            _check_screen_free(db, show.movie_id, show.screen_id, show.start_time, exclude_show_id=show.id)
+    if moved_from is not None:
+        # Seat bit positions follow the screen's layout: the seat map is locked, checked against the new
+        # screen's layout and rebuilt for it, as set_screen_layout does for a layout change.
+        seat_map = db.query(ShowSeatMap).filter(ShowSeatMap.show_id == show.id).with_for_update().populate_existing().first()
+        layout = screen_layout(db, screen_id)
+        ensure_layout_keeps_seats(db, [show.id], layout)
+        if seat_map is not None:
+            rebuild_seat_map(db, show.id, layout)
     db.commit()
     db.refresh(show)
+    invalidate_item("shows", show.id)
+    invalidate_lists("shows", "showtimes")
+    if moved_from is not None:
+        invalidate_seat_availability(show.id)
     return show
 
 
 def delete_show(db: Session, show: Show) -> None:
+    show_id = show.id
     db.delete(show)
     db.commit()
+    invalidate_item("shows", show_id)
+    invalidate_lists("shows", "showtimes")
+    invalidate_seat_availability(show_id)
+
+
+def expand_template(template: ShowScheduleTemplate) -> list[dict]:
+    items = []
+    day = template.start_date
+    while day <= template.end_date:
+        for screen_id in template.screen_ids:
+            for at in template.times:
+                items.append({"movie_id": template.movie_id, "screen_id": screen_id, "start_time": datetime.combine(day, at)})
+        day += timedelta(days=1)
+    return items
+
+
+def bulk_create_shows(db: Session, items: list[dict]) -> dict:
+    items = [{**item, "start_time": _as_naive(item["start_time"])} for item in items]
+    results = [{"index": i, "status": "invalid", **item} for i, item in enumerate(items)]
+    if not items:
+        return {"created": 0, "results": results}
+
+    movie_ids = {item["movie_id"] for item in items}
+    screen_ids = {item["screen_id"] for item in items}
+    durations = dict(db.query(Movie.id, Movie.duration).filter(Movie.id.in_(movie_ids)))
+    known_screens = {sid for (sid,) in db.query(Screen.id).filter(Screen.id.in_(screen_ids)).with_for_update()}
+
+    window_start = min(item["start_time"] for item in items)
+    window_end = max(_screen_busy_until(item["start_time"], durations.get(item["movie_id"], 0)) for item in items)
+    schedules = _load_schedules(db, known_screens, window_start, window_end)
+
+    accepted = []
+    for result in sorted(results, key=lambda r: r["start_time"]):
+        if result["movie_id"] not in durations:
+            result["detail"] = "Movie not found"
+            continue
+        if result["screen_id"] not in known_screens:
+            result["detail"] = "Screen not found"
+            continue
+        start = result["start_time"]
+        end = _screen_busy_until(start, durations[result["movie_id"]])
+        clash = schedules[result["screen_id"]].conflict(start, end)
+        if clash is not None:
+            result["status"] = "conflict"
+            result["detail"] = f"Overlaps show {clash[2]}" if clash[2] else "Overlaps another show in this batch"
+            continue
+        schedules[result["screen_id"]].add(start, end)
+        accepted.append(result)
+
+    if accepted:
+        rows = [{"movie_id": r["movie_id"], "screen_id": r["screen_id"], "start_time": r["start_time"]} for r in accepted]
+        try:
+            db.execute(insert(Show), rows)
+            ids = {
+                (screen_id, start): show_id
+                for show_id, screen_id, start in db.query(Show.id, Show.screen_id, Show.start_time).filter(
+                    Show.screen_id.in_({r["screen_id"] for r in accepted}),
+                    Show.start_time >= min(r["start_time"] for r in accepted),
+                    Show.start_time <= max(r["start_time"] for r in accepted),
+                )
+            }
+            db.commit()
+        except IntegrityError:
+            db.rollback()
+            raise HTTPException(status_code=status.HTTP_409_CONFLICT, detail="Schedule changed concurrently, retry")
+        for r in accepted:
+            r["status"] = "created"
+            r["show_id"] = ids[(r["screen_id"], r["start_time"])]
+        invalidate_lists("shows", "showtimes")
+
+    return {"created": len(accepted), "results": results}
@@ -0,0 +1,104 @@
+"""Compare booking throughput of one create_booking per order against create_bookings batches.
+
+Runs against the database configured in Settings:
+
+    python -m benchmarks.batch_booking --shows 20 --batch-size 100
+"""
+from __future__ import annotations
+import argparse
+import time
+from datetime import datetime, timedelta
+
+from app.core.database import Base, SessionLocal, engine
+from app.models.models import Cinema, Movie, Screen, Show, User
+from app.services import booking_service
+
+
+def _fixtures(shows: int) -> tuple[list[int], int, int]:
+    db = SessionLocal()
+    try:
+        tag = f"batch-{time.time_ns()}"
+        cinema = Cinema(name=tag, location="bench")
+        movie = Movie(title=tag, description="", duration=120)
+        user = User(name=tag, email=f"{tag}@bench.local", password="!")
+        db.add_all([cinema, movie, user])
+        db.flush()
+        screen = Screen(cinema_id=cinema.id, name=tag)
+        db.add(screen)
+        db.flush()
+        start = datetime.utcnow() + timedelta(days=365)
+        rows = [Show(movie_id=movie.id, screen_id=screen.id, start_time=start + timedelta(hours=3 * i)) for i in range(shows)]
+        db.add_all(rows)
+        db.commit()
+        return [show.id for show in rows], user.id, cinema.id
+    finally:
+        db.close()
+
+
+def _orders(show_ids: list[int], seats_per_order: int) -> list[dict]:
+    # Fill every seat of every show, seats_per_order adjacent seats at a time.
+    per_row = booking_service.TOTAL_COLS // seats_per_order
+    return [
+        {"show_id": show_id, "seats": [{"row": r, "col": k * seats_per_order + c} for c in range(seats_per_order)]}
+        for show_id in show_ids
+        for r in range(booking_service.TOTAL_ROWS)
+        for k in range(per_row)
+    ]
+
+
+def _single(user_id: int, orders: list[dict]) -> int:
+    for order in orders:
+        db = SessionLocal()
+        try:
+            booking_service.create_booking(db, user_id, order["show_id"], order["seats"])
+        finally:
+            db.close()
+    return len(orders)
+
+
+def _batched(user_id: int, orders: list[dict], batch_size: int, atomic: bool) -> int:
+    booked = 0
+    for i in range(0, len(orders), batch_size):
+        db = SessionLocal()
+        try:
+            booked += booking_service.create_bookings(db, user_id, orders[i:i + batch_size], atomic)["booked"]
+        finally:
+            db.close()
+    return booked
+
+
+def _cleanup(cinema_id: int, user_id: int) -> None:
+    db = SessionLocal()
+    try:
+        for show in db.query(Show).join(Screen).filter(Screen.cinema_id == cinema_id):
+            db.delete(show)
+        db.delete(db.get(Cinema, cinema_id))
+        db.delete(db.get(User, user_id))
+        db.commit()
+    finally:
+        db.close()
+
+
+def run(shows: int, seats_per_order: int, batch_size: int, atomic: bool) -> None:
+    Base.metadata.create_all(bind=engine)
+    for name, book in (
+        ("single", _single),
+        (f"batch x{batch_size}", lambda user_id, orders: _batched(user_id, orders, batch_size, atomic)),
+    ):
+        show_ids, user_id, cinema_id = _fixtures(shows)
+        orders = _orders(show_ids, seats_per_order)
+        started = time.perf_counter()
+        booked = book(user_id, orders)
+        elapsed = time.perf_counter() - started
+        _cleanup(cinema_id, user_id)
+        print(f"{name:>12}: {booked}/{len(orders)} orders in {elapsed:.2f}s ({booked / elapsed:.0f} orders/s)")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--shows", type=int, default=20)
+    parser.add_argument("--seats-per-order", type=int, default=2)
+    parser.add_argument("--batch-size", type=int, default=100)
+    parser.add_argument("--per-item", action="store_true", help="commit each item on its own instead of all-or-nothing")
+    args = parser.parse_args()
+    run(args.shows, args.seats_per_order, args.batch_size, not args.per_item)
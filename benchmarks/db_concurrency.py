@@ -0,0 +1,100 @@
+"""Compare how many requests one worker keeps in flight on the sync and async DB stacks.
+
+Every request runs one query that takes a fixed time on the server, so throughput x latency
+is the concurrency the worker actually achieved. Runs against the database in Settings:
+
+    python -m benchmarks.db_concurrency --latency 0.05 --concurrency 200 --requests 2000
+"""
+from __future__ import annotations
+import argparse
+import asyncio
+import time
+
+import httpx
+from fastapi import Depends, FastAPI
+from sqlalchemy import create_engine, event, text
+from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine
+from sqlalchemy.orm import Session, sessionmaker
+
+from app.core.config import settings
+from app.core.database import run_db
+
+SLEEP_SQL = {
+    "postgresql": "SELECT pg_sleep(:seconds)",
+    "mysql": "SELECT SLEEP(:seconds)",
+    "sqlite": "SELECT sleep(:seconds)",
+}
+
+
+def _sqlite_sleep(engine) -> None:
+    @event.listens_for(engine, "connect")
+    def register(dbapi_connection, _record) -> None:
+        dbapi_connection.create_function("sleep", 1, lambda seconds: time.sleep(seconds) or 0)
+
+
+def build_app(latency: float, pool_size: int) -> FastAPI:
+    sync_engine = create_engine(settings.sync_database_url, pool_size=pool_size, max_overflow=0)
+    async_engine = create_async_engine(settings.async_database_url, pool_size=pool_size, max_overflow=0)
+    if sync_engine.dialect.name == "sqlite":
+        _sqlite_sleep(sync_engine)
+        _sqlite_sleep(async_engine.sync_engine)
+    sql = text(SLEEP_SQL[sync_engine.dialect.name])
+    SyncSession = sessionmaker(bind=sync_engine)
+    AsyncSession = async_sessionmaker(bind=async_engine)
+
+    def get_sync_db():
+        db = SyncSession()
+        try:
+            yield db
+        finally:
+            db.close()
+
+    async def get_async_db():
+        async with AsyncSession() as db:
+            yield db
+
+    def query(db: Session) -> None:
+        db.execute(sql, {"seconds": latency})
+
+    app = FastAPI()
+
+    @app.get("/sync")
+    async def sync_probe(db=Depends(get_sync_db)):
+        await run_db(db, query)
+
+    @app.get("/async")
+    async def async_probe(db=Depends(get_async_db)):
+        await run_db(db, query)
+
+    return app
+
+
+async def _drive(app: FastAPI, path: str, concurrency: int, requests: int) -> float:
+    gate = asyncio.Semaphore(concurrency)
+    async with httpx.AsyncClient(transport=httpx.ASGITransport(app=app), base_url="http://bench") as client:
+        async def one() -> None:
+            async with gate:
+                (await client.get(path)).raise_for_status()
+
+        await client.get(path)  # warm the pool
+        started = time.perf_counter()
+        await asyncio.gather(*(one() for _ in range(requests)))
+        return time.perf_counter() - started
+
+
+async def main(latency: float, concurrency: int, requests: int) -> None:
+    app = build_app(latency, pool_size=concurrency)
+    print(f"{requests} requests, {concurrency} client concurrency, {latency * 1000:.0f} ms per query")
+    for stack in ("sync", "async"):
+        elapsed = await _drive(app, f"/{stack}", concurrency, requests)
+        rps = requests / elapsed
+        print(f"{stack:>5}: {rps:8.1f} req/s, {rps * latency:6.1f} requests in flight")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--latency", type=float, default=0.05)
+    parser.add_argument("--concurrency", type=int, default=200)
+    parser.add_argument("--requests", type=int, default=2000)
+    args = parser.parse_args()
+    asyncio.run(main(args.latency, args.concurrency, args.requests))
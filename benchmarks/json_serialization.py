@@ -0,0 +1,131 @@
+"""Per-row cost of serving GET /api/shows pages: ORM entities through response_model (before)
+against column projection and FastJSONResponse (now), on a cache miss and on a cache hit.
+
+Runs against the database configured in Settings:
+
+    python -m benchmarks.json_serialization --shows 5000 --repeat 5
+"""
+from __future__ import annotations
+import argparse
+import json
+import time
+from datetime import datetime, timedelta
+from typing import Callable
+
+from pydantic import TypeAdapter
+from sqlalchemy import insert
+
+from app.core.database import Base, SessionLocal, engine
+from app.core.pagination import MAX_LIMIT, paginate
+from app.core.responses import dumps, loads, orjson
+from app.models.models import Cinema, Movie, Screen, Show
+from app.schemas.schemas import ShowOut
+from app.services import show_service
+
+response_model = TypeAdapter(list[ShowOut])
+
+
+def _fixtures(shows: int) -> tuple[int, int, int]:
+    db = SessionLocal()
+    try:
+        tag = f"json-{time.time_ns()}"
+        cinema = Cinema(name=tag, location="bench")
+        movie = Movie(title=tag, description="", duration=90)
+        db.add_all([cinema, movie])
+        db.flush()
+        screen = Screen(cinema_id=cinema.id, name=tag)
+        db.add(screen)
+        db.flush()
+        start = datetime.utcnow() + timedelta(days=365)
+        db.execute(insert(Show), [
+            {"movie_id": movie.id, "screen_id": screen.id, "start_time": start + timedelta(minutes=i)} for i in range(shows)
+        ])
+        db.commit()
+        return cinema.id, movie.id, screen.id
+    finally:
+        db.close()
+
+
+def _pages(load_page: Callable[[str | None], tuple[list, str | None]]) -> list[list]:
+    pages, cursor = [], None
+    while True:
+        page, cursor = load_page(cursor)
+        pages.append(page)
+        if cursor is None:
+            return pages
+
+
+def _before_miss(db, screen_id: int) -> list[bytes]:
+    def load_page(cursor):
+        shows, next_cursor = paginate(db.query(Show).filter(Show.screen_id == screen_id), [Show.start_time, Show.id], MAX_LIMIT, cursor)
+        return [ShowOut.model_validate(s).model_dump(mode="json") for s in shows], next_cursor
+
+    return [response_model.dump_json(response_model.validate_python(items)) for items in _pages(load_page)]
+
+
+def _now_miss(db, screen_id: int) -> list[bytes]:
+    def load_page(cursor):
+        rows, next_cursor = show_service.list_shows(db, MAX_LIMIT, cursor, screen_id=screen_id)
+        return [row._asdict() for row in rows], next_cursor
+
+    return [dumps(items) for items in _pages(load_page)]
+
+
+def _before_hit(cached: list[str]) -> list[bytes]:
+    return [response_model.dump_json(response_model.validate_python(json.loads(page))) for page in cached]
+
+
+def _now_hit(cached: list[str]) -> list[bytes]:
+    return [dumps(loads(page)) for page in cached]
+
+
+def _time(fn: Callable[[], list[bytes]], repeat: int) -> tuple[float, list[bytes]]:
+    best, body = float("inf"), []
+    for _ in range(repeat):
+        started = time.perf_counter()
+        body = fn()
+        best = min(best, time.perf_counter() - started)
+    return best, body
+
+
+def _cleanup(cinema_id: int, movie_id: int, screen_id: int) -> None:
+    db = SessionLocal()
+    try:
+        db.query(Show).filter(Show.screen_id == screen_id).delete(synchronize_session=False)
+        db.delete(db.get(Screen, screen_id))
+        db.delete(db.get(Cinema, cinema_id))
+        db.delete(db.get(Movie, movie_id))
+        db.commit()
+    finally:
+        db.close()
+
+
+def run(shows: int, repeat: int) -> None:
+    Base.metadata.create_all(bind=engine)
+    cinema_id, movie_id, screen_id = _fixtures(shows)
+    db = SessionLocal()
+    try:
+        print(f"{shows} shows in pages of {MAX_LIMIT}, encoder: {'orjson' if orjson is not None else 'json'}")
+        results = {}
+        for name, fn in (("before", _before_miss), ("now", _now_miss)):
+            results[name] = _time(lambda: fn(db, screen_id), repeat)
+            db.expunge_all()
+        cached = [body.decode() for body in results["now"][1]]
+        for name, fn in (("before", _before_hit), ("now", _now_hit)):
+            results[f"{name} (hit)"] = _time(lambda: fn(cached), repeat)
+    finally:
+        db.close()
+        _cleanup(cinema_id, movie_id, screen_id)
+
+    assert results["before"][1] == results["now"][1], "the two paths must produce the same bytes"
+    for miss_or_hit, (before, now) in (("cache miss", ("before", "now")), ("cache hit", ("before (hit)", "now (hit)"))):
+        b, n = results[before][0], results[now][0]
+        print(f"{miss_or_hit:>10}: before {b / shows * 1e6:6.2f} us/row, now {n / shows * 1e6:6.2f} us/row ({b / n:.1f}x)")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--shows", type=int, default=5000)
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+    run(args.shows, args.repeat)
@@ -0,0 +1,80 @@
+"""Login throughput and how much a login storm slows everything else down.
+
+Fires --logins concurrent logins at the app in-process and, at the same time, measures the
+latency of a cheap endpoint. Tune PASSWORD_HASH_WORKERS / PASSWORD_HASH_QUEUE_SIZE /
+PASSWORD_HASH_ROUNDS and compare:
+
+    python -m benchmarks.login_throughput --logins 400 --concurrency 64
+"""
+from __future__ import annotations
+import argparse
+import asyncio
+import statistics
+import time
+from collections import Counter
+
+import httpx
+
+from app.core.config import settings
+from app.core.database import SessionLocal
+from app.core.security import hash_password
+from app.models.models import User
+
+import main
+
+
+def _bench_user() -> tuple[str, str]:
+    email, password = f"login-bench-{time.time_ns()}@bench.local", "bench-password"
+    db = SessionLocal()
+    try:
+        db.add(User(name="login bench", email=email, password=hash_password(password)))
+        db.commit()
+    finally:
+        db.close()
+    return email, password
+
+
+async def run(logins: int, concurrency: int) -> None:
+    email, password = _bench_user()
+    gate = asyncio.Semaphore(concurrency)
+    statuses: Counter[int] = Counter()
+    probe_latencies: list[float] = []
+    done = asyncio.Event()
+
+    async with httpx.AsyncClient(transport=httpx.ASGITransport(app=main.app), base_url="http://bench") as client:
+        async def login() -> None:
+            async with gate:
+                response = await client.post("/api/auth/login", data={"username": email, "password": password})
+                statuses[response.status_code] += 1
+
+        async def probe() -> None:
+            while not done.is_set():
+                started = time.perf_counter()
+                await client.get("/health")
+                probe_latencies.append(time.perf_counter() - started)
+                await asyncio.sleep(0.01)
+
+        prober = asyncio.create_task(probe())
+        started = time.perf_counter()
+        await asyncio.gather(*(login() for _ in range(logins)))
+        elapsed = time.perf_counter() - started
+        done.set()
+        await prober
+
+    ok = statuses.get(200, 0)
+    print(
+        f"rounds={settings.password_hash_rounds} workers={settings.password_hash_workers} "
+        f"queue={settings.password_hash_queue_size} concurrency={concurrency}"
+    )
+    print(f"{logins} logins in {elapsed:.2f}s: {ok / elapsed:.1f} successful logins/s, statuses {dict(statuses)}")
+    if probe_latencies:
+        q = statistics.quantiles(probe_latencies, n=100)
+        print(f"/health during the storm: p50 {q[49] * 1000:.1f} ms, p99 {q[98] * 1000:.1f} ms over {len(probe_latencies)} probes")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--logins", type=int, default=400)
+    parser.add_argument("--concurrency", type=int, default=64)
+    args = parser.parse_args()
+    asyncio.run(run(args.logins, args.concurrency))
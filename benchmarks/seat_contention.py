@@ -0,0 +1,128 @@
+"""Hammer one show with concurrent bookings and check that no seat is ever sold twice.
+
+Runs against the database configured in Settings:
+
+    python -m benchmarks.seat_contention --threads 32 --attempts 2000
+
+Every attempt must end booked or with a 409; anything else (a deadlock, a driver error) fails the run.
+Point it at Postgres: SQLite serialises writers on a file lock and fails some of them with
+"database is locked", which this check reports too.
+
+With --best-available each attempt asks for a block of seats instead of picking coordinates, which
+shows how many collisions the server-side allocation avoids on a selling-out show.
+"""
+from __future__ import annotations
+import argparse
+import random
+import threading
+import time
+from collections import Counter
+from datetime import datetime, timedelta
+
+from fastapi import HTTPException
+
+from app.core.database import Base, SessionLocal, engine
+from app.models.models import Booking, Cinema, Movie, Screen, Show, User
+from app.services import booking_service
+
+
+def _fixtures() -> tuple[int, int]:
+    db = SessionLocal()
+    try:
+        tag = f"contention-{time.time_ns()}"
+        cinema = Cinema(name=tag, location="bench")
+        movie = Movie(title=tag, description="", duration=120)
+        user = User(name=tag, email=f"{tag}@bench.local", password="!")
+        db.add_all([cinema, movie, user])
+        db.flush()
+        screen = Screen(cinema_id=cinema.id, name=tag)
+        db.add(screen)
+        db.flush()
+        show = Show(movie_id=movie.id, screen_id=screen.id, start_time=datetime.utcnow() + timedelta(days=365))
+        db.add(show)
+        db.commit()
+        return show.id, user.id
+    finally:
+        db.close()
+
+
+def _cleanup(show_id: int, user_id: int) -> None:
+    db = SessionLocal()
+    try:
+        show = db.get(Show, show_id)
+        # The cinema takes its screen, the show and the show's bookings with it.
+        db.delete(db.get(Cinema, db.get(Screen, show.screen_id).cinema_id))
+        db.delete(db.get(Movie, show.movie_id))
+        db.delete(db.get(User, user_id))
+        db.commit()
+    finally:
+        db.close()
+
+
+def run(threads: int, attempts: int, max_seats: int, best_available: bool = False) -> None:
+    Base.metadata.create_all(bind=engine)
+    show_id, user_id = _fixtures()
+    outcomes: Counter[str] = Counter()
+    lock = threading.Lock()
+    remaining = iter(range(attempts))
+
+    def worker() -> None:
+        rng = random.Random()
+        while True:
+            with lock:
+                if next(remaining, None) is None:
+                    return
+            seats = {(rng.randrange(booking_service.TOTAL_ROWS), rng.randrange(booking_service.TOTAL_COLS)) for _ in range(rng.randint(1, max_seats))}
+            db = SessionLocal()
+            try:
+                if best_available:
+                    booking_service.book_best_available(db, user_id, show_id, len(seats), rng.choice(booking_service.ZONES))
+                else:
+                    booking_service.create_booking(db, user_id, show_id, [{"row": r, "col": c} for r, c in seats])
+                result = "booked"
+            except HTTPException as exc:
+                result = "conflict" if exc.status_code == 409 else f"http_{exc.status_code}"
+            except Exception as exc:  # noqa: BLE001 - counted here, fails the run below
+                result = type(exc).__name__
+            finally:
+                db.close()
+            with lock:
+                outcomes[result] += 1
+
+    started = time.perf_counter()
+    pool = [threading.Thread(target=worker) for _ in range(threads)]
+    for t in pool:
+        t.start()
+    for t in pool:
+        t.join()
+    elapsed = time.perf_counter() - started
+
+    db = SessionLocal()
+    try:
+        sold: Counter[tuple[int, int]] = Counter()
+        for (seats,) in db.query(Booking.seats).filter(Booking.show_id == show_id):
+            sold.update((s["row"], s["col"]) for s in seats)
+        double_sold = {seat: n for seat, n in sold.items() if n > 1}
+    finally:
+        db.close()
+        _cleanup(show_id, user_id)
+
+    print(f"{attempts} attempts on {threads} threads in {elapsed:.2f}s ({attempts / elapsed:.0f}/s)")
+    print(f"outcomes: {dict(outcomes)}")
+    print(f"seats sold: {len(sold)}, double-sold: {len(double_sold)}")
+    if double_sold:
+        raise SystemExit(f"double-sold seats: {double_sold}")
+    # Under contention a request must either book or get a 409; a deadlock or other driver error is a bug.
+    unexpected = {outcome: n for outcome, n in outcomes.items() if outcome not in ("booked", "conflict")}
+    if unexpected:
+        raise SystemExit(f"unexpected outcomes: {unexpected}")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--threads", type=int, default=32)
+    parser.add_argument("--attempts", type=int, default=2000)
+    parser.add_argument("--max-seats", type=int, default=4)
+    parser.add_argument("--best-available", action="store_true", help="request seat blocks instead of exact seats")
+    args = parser.parse_args()
+    run(args.threads, args.attempts, args.max_seats, args.best_available)
@@ -2,33 +2,50 @@ import { useState, useEffect } from 'react'
 import api from '../services/api'
 
 const SeatGrid = ({ showId, onSeatsSelected }) => {
-  const [seats, setSeats] = useState([])
+  const [seatMap, setSeatMap] = useState({ rows: 10, cols: 10, occupied: [] })
   const [selectedSeats, setSelectedSeats] = useState([])
   const [loading, setLoading] = useState(true)
 
   useEffect(() => {
-    if (showId) {
-      fetchBookedSeats()
-    }
+    if (!showId) return
+    fetchSeatMap()
+
+    const events = new EventSource(`/api/shows/${showId}/seats/stream`)
+    events.addEventListener('snapshot', (e) => setSeatMap(JSON.parse(e.data)))
+    events.addEventListener('seats', (e) => {
+      const delta = JSON.parse(e.data)
+      setSeatMap(prev => {
+        if (delta.version <= prev.version) return prev
+        if (delta.version !== prev.version + 1) {
+          fetchSeatMap()
+          return prev
+        }
+        const occupied = prev.occupied.map(row => row.split(''))
+        delta.booked.forEach(([row, col]) => { occupied[row][col] = '1' })
+        delta.released.forEach(([row, col]) => { occupied[row][col] = '0' })
+        ;(delta.held || []).forEach(([row, col]) => { occupied[row][col] = '2' })
+        setSelectedSeats(selected => selected.filter(s => occupied[s.row][s.col] === '0'))
+        return { ...prev, version: delta.version, occupied: occupied.map(row => row.join('')) }
+      })
+    })
+    return () => events.close()
   }, [showId])
 
-  const fetchBookedSeats = async () => {
+  const fetchSeatMap = async () => {
     try {
-      const response = await api.get('/bookings/me')
-      const bookedSeats = response.data
-        .filter(booking => booking.show_id === showId)
-        .flatMap(booking => booking.seats)
-      
-      setSeats(bookedSeats)
+      const response = await api.get(`/shows/${showId}/seats`)
+      setSeatMap(response.data)
       setLoading(false)
     } catch (error) {
-      console.error('Error fetching booked seats:', error)
+      console.error('Error fetching seat map:', error)
       setLoading(false)
     }
   }
 
   const isSeatBooked = (row, col) => {
-    return seats.some(seat => seat.row === row && seat.col === col)
+    // '1' is sold, '2' is held by someone at checkout; both are unavailable
+    const state = seatMap.occupied[row]?.[col]
+    return state === '1' || state === '2'
   }
 
   const isSeatSelected = (row, col) => {
@@ -63,9 +80,13 @@ const SeatGrid = ({ showId, onSeatsSelected }) => {
   return (
     <div>
       <h3>Select Seats (Max 6)</h3>
-      <div className="seat-grid">
-        {Array.from({ length: 10 }, (_, row) =>
-          Array.from({ length: 10 }, (_, col) => {
+      <div className="seat-grid" style={{ gridTemplateColumns: `repeat(${seatMap.cols}, 1fr)` }}>
+        {Array.from({ length: seatMap.rows }, (_, row) =>
+          Array.from({ length: seatMap.cols }, (_, col) => {
+            if (seatMap.occupied[row]?.[col] === '-') {
+              // aisle or blocked position in this screen's layout
+              return <div key={`${row}-${col}`} className="seat-gap"></div>
+            }
             const isBooked = isSeatBooked(row, col)
             const isSelected = isSeatSelected(row, col)
             
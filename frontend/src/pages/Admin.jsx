@@ -1,6 +1,6 @@
 import { useState, useEffect } from 'react'
 import { useAuth } from '../contexts/AuthContext'
-import api from '../services/api'
+import api, { getAll } from '../services/api'
 
 const Admin = () => {
   const { user } = useAuth()
@@ -35,16 +35,16 @@ const Admin = () => {
 
   const fetchData = async () => {
     try {
-      const [moviesRes, cinemasRes, screensRes, showsRes] = await Promise.all([
-        api.get('/movies/'),
-        api.get('/cinemas/'),
-        api.get('/screens/'),
-        api.get('/shows/')
+      const [allMovies, allCinemas, allScreens, allShows] = await Promise.all([
+        getAll('/movies/'),
+        getAll('/cinemas/'),
+        getAll('/screens/'),
+        getAll('/shows/')
       ])
-      setMovies(moviesRes.data)
-      setCinemas(cinemasRes.data)
-      setScreens(screensRes.data)
-      setShows(showsRes.data)
+      setMovies(allMovies)
+      setCinemas(allCinemas)
+      setScreens(allScreens)
+      setShows(allShows)
     } catch (error) {
       setError('Failed to fetch data')
     }
@@ -510,13 +510,18 @@ const Admin = () => {
 const SeatLayoutView = ({ shows, movies, screens, cinemas }) => {
   const [selectedShow, setSelectedShow] = useState('')
   const [bookings, setBookings] = useState([])
+  const [grid, setGrid] = useState({ rows: 10, cols: 10 })
   const [loading, setLoading] = useState(false)
 
   const fetchBookings = async (showId) => {
     setLoading(true)
     try {
-      const response = await api.get(`/shows/${showId}/bookings`)
-      setBookings(response.data)
+      const [attendees, seats] = await Promise.all([
+        getAll(`/shows/${showId}/bookings`),
+        api.get(`/shows/${showId}/seats`)
+      ])
+      setBookings(attendees)
+      setGrid({ rows: seats.data.rows, cols: seats.data.cols })
     } catch (error) {
       console.error('Failed to fetch bookings:', error)
       setBookings([])
@@ -542,8 +547,8 @@ const SeatLayoutView = ({ shows, movies, screens, cinemas }) => {
     return { show, movie, screen, cinema }
   }
 
-  const getSeatBooking = (seat) => {
-    return bookings.find(b => b.seat === seat)
+  const getSeatBooking = (row, col) => {
+    return bookings.find(b => b.row === row && b.col === col)
   }
 
   const showDetails = selectedShow ? getShowDetails(selectedShow) : null
@@ -591,14 +596,16 @@ const SeatLayoutView = ({ shows, movies, screens, cinemas }) => {
               <h4>Seat Layout (Hover over booked seats to see user details)</h4>
               <div style={{ 
                 display: 'grid', 
-                gridTemplateColumns: 'repeat(10, 1fr)', 
+                gridTemplateColumns: `repeat(${grid.cols}, 1fr)`, 
                 gap: '8px',
                 maxWidth: '600px',
                 margin: '20px 0'
               }}>
-                {Array.from({ length: 80 }, (_, i) => {
-                  const seatNumber = String.fromCharCode(65 + Math.floor(i / 10)) + (i % 10 + 1)
-                  const booking = getSeatBooking(seatNumber)
+                {Array.from({ length: grid.rows * grid.cols }, (_, i) => {
+                  const row = Math.floor(i / grid.cols)
+                  const col = i % grid.cols
+                  const seatNumber = `${row}${col}`
+                  const booking = getSeatBooking(row, col)
                   const isBooked = !!booking
                   
                   return (
@@ -1,7 +1,7 @@
 import { useState, useEffect } from 'react'
 import { useAuth } from '../contexts/AuthContext'
 import { useLocation } from 'react-router-dom'
-import api from '../services/api'
+import api, { getAll } from '../services/api'
 import SeatGrid from '../components/SeatGrid'
 
 const Booking = () => {
@@ -9,9 +9,8 @@ const Booking = () => {
   const location = useLocation()
   const [step, setStep] = useState(1)
   const [cinemas, setCinemas] = useState([])
-  const [screens, setScreens] = useState([])
   const [movies, setMovies] = useState([])
-  const [allShows, setAllShows] = useState([])
+  const [showtimes, setShowtimes] = useState([])
   const [selectedMovie, setSelectedMovie] = useState('')
   const [selectedCinema, setSelectedCinema] = useState(null)
   const [selectedShow, setSelectedShow] = useState('')
@@ -27,7 +26,7 @@ const Booking = () => {
     }
     fetchMovies()
     fetchCinemas()
-    fetchAllShows()
+    fetchShowtimes()
     
     if (location.state?.selectedMovie) {
       setSelectedMovie(location.state.selectedMovie.id.toString())
@@ -36,8 +35,7 @@ const Booking = () => {
 
   const fetchMovies = async () => {
     try {
-      const response = await api.get('/movies/')
-      setMovies(response.data)
+      setMovies(await getAll('/movies/'))
     } catch (error) {
       console.error('Error fetching movies:', error)
     }
@@ -45,40 +43,26 @@ const Booking = () => {
 
   const fetchCinemas = async () => {
     try {
-      const response = await api.get('/cinemas/')
-      setCinemas(response.data)
+      setCinemas(await getAll('/cinemas/'))
     } catch (error) {
       console.error('Error fetching cinemas:', error)
     }
   }
 
-  const fetchAllShows = async () => {
+  const fetchShowtimes = async () => {
     try {
-      const response = await api.get('/shows/')
-      setAllShows(response.data)
+      const response = await api.get('/shows/showtimes', { params: { days: 31 } })
+      setShowtimes(response.data)
     } catch (error) {
-      console.error('Error fetching shows:', error)
-    }
-  }
-
-  const fetchScreens = async (cinemaId) => {
-    try {
-      const response = await api.get('/screens/')
-      setScreens(prevScreens => {
-        const newScreens = response.data.filter(screen => screen.cinema_id === Number(cinemaId))
-        return [...prevScreens, ...newScreens]
-      })
-    } catch (error) {
-      console.error('Error fetching screens:', error)
+      console.error('Error fetching showtimes:', error)
     }
   }
 
   const getShowsForCinema = (cinemaId) => {
     if (!selectedMovie) return []
-    return allShows.filter(show => {
-      const screen = screens.find(s => s.id === show.screen_id)
-      return screen?.cinema_id === cinemaId && show.movie_id === Number(selectedMovie)
-    })
+    const cinema = showtimes.find(c => c.id === cinemaId)
+    const movie = cinema?.movies.find(m => m.id === Number(selectedMovie))
+    return movie?.showtimes ?? []
   }
 
   const handleMovieChange = (movieId) => {
@@ -134,12 +118,6 @@ const Booking = () => {
     return ''
   }
 
-  useEffect(() => {
-    if (cinemas.length > 0) {
-      cinemas.forEach(cinema => fetchScreens(cinema.id))
-    }
-  }, [cinemas])
-
   return (
     <div>
       <h1 className="section-title">Book Your Experience</h1>
@@ -266,8 +244,8 @@ const Booking = () => {
                     }}>
                       {cinemaShows.map(show => (
                         <button
-                          key={show.id}
-                          onClick={() => handleShowSelect(cinema.id, show.id)}
+                          key={show.show_id}
+                          onClick={() => handleShowSelect(cinema.id, show.show_id)}
                           style={{
                             padding: '16px',
                             background: 'var(--bg-tertiary)',
@@ -2,7 +2,7 @@ import { useState, useEffect } from 'react'
 import { Link } from 'react-router-dom'
 import { useAuth } from '../contexts/AuthContext'
 import { useLocation } from 'react-router-dom'
-import api from '../services/api'
+import { getAll } from '../services/api'
 import MovieCard from '../components/MovieCard'
 
 const Home = () => {
@@ -17,8 +17,7 @@ const Home = () => {
 
   const fetchMovies = async () => {
     try {
-      const response = await api.get('/movies/')
-      setMovies(response.data)
+      setMovies(await getAll('/movies/'))
     } catch (error) {
       console.error('Error fetching movies:', error)
     } finally {
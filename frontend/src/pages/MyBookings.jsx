@@ -5,6 +5,8 @@ import api from '../services/api'
 const MyBookings = () => {
   const { user } = useAuth()
   const [bookings, setBookings] = useState([])
+  const [when, setWhen] = useState('upcoming')
+  const [nextCursor, setNextCursor] = useState(null)
   const [loading, setLoading] = useState(true)
   const [error, setError] = useState('')
 
@@ -14,12 +16,13 @@ const MyBookings = () => {
       return
     }
     fetchBookings()
-  }, [user])
+  }, [user, when])
 
-  const fetchBookings = async () => {
+  const fetchBookings = async (cursor) => {
     try {
-      const response = await api.get('/bookings/me')
-      setBookings(response.data)
+      const response = await api.get('/bookings/me', { params: { when, limit: 20, cursor } })
+      setBookings(prev => cursor ? [...prev, ...response.data] : response.data)
+      setNextCursor(response.headers['x-next-cursor'] || null)
     } catch (error) {
       setError('Failed to fetch bookings')
       console.error('Error fetching bookings:', error)
@@ -50,10 +53,21 @@ const MyBookings = () => {
     return <div className="error">{error}</div>
   }
 
+  const filter = (
+    <div style={{ marginBottom: '20px' }}>
+      <select value={when} onChange={(e) => setWhen(e.target.value)}>
+        <option value="upcoming">Upcoming</option>
+        <option value="past">Past</option>
+        <option value="all">All</option>
+      </select>
+    </div>
+  )
+
   if (bookings.length === 0) {
     return (
       <div className="text-center">
         <h1>My Bookings</h1>
+        {filter}
         <p>You have no bookings yet.</p>
       </div>
     )
@@ -62,12 +76,15 @@ const MyBookings = () => {
   return (
     <div>
       <h1>My Bookings</h1>
+      {filter}
       
       <div className="grid">
         {bookings.map(booking => (
           <div key={booking.id} className="card">
-            <h3>Booking #{booking.id}</h3>
-            <p><strong>Show ID:</strong> {booking.show_id}</p>
+            <h3>{booking.movie_title}</h3>
+            <p><strong>Booking #</strong>{booking.id}</p>
+            <p><strong>Where:</strong> {booking.cinema_name} - {booking.screen_name}</p>
+            <p><strong>Show Time:</strong> {new Date(booking.show_start).toLocaleString()}</p>
             <p><strong>Seats:</strong> {booking.seats.map(seat => `Row ${seat.row}, Col ${seat.col}`).join(', ')}</p>
             <p><strong>Booked on:</strong> {new Date(booking.created_at).toLocaleString()}</p>
             
@@ -81,6 +98,12 @@ const MyBookings = () => {
           </div>
         ))}
       </div>
+
+      {nextCursor && (
+        <div className="text-center" style={{ marginTop: '20px' }}>
+          <button className="btn" onClick={() => fetchBookings(nextCursor)}>Load more</button>
+        </div>
+      )}
     </div>
   )
 }
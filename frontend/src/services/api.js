@@ -17,4 +17,16 @@ api.interceptors.response.use(
   }
 )
 
+// List endpoints are cursor-paginated; follow X-Next-Cursor until the last page.
+export const getAll = async (url, params = {}) => {
+  const items = []
+  let cursor
+  do {
+    const response = await api.get(url, { params: { ...params, limit: 500, cursor } })
+    items.push(...response.data)
+    cursor = response.headers['x-next-cursor']
+  } while (cursor)
+  return items
+}
+
 export default api
@@ -1,14 +1,36 @@
+import asyncio
+from contextlib import asynccontextmanager, suppress
+
 from fastapi import FastAPI
+from fastapi.concurrency import run_in_threadpool
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.responses import PlainTextResponse
 
 from app.core.config import settings
 
-from app.routers import auth, users, cinemas, screens, movies, shows, bookings
+from app.routers import auth, users, cinemas, screens, movies, shows, bookings, admin
 from app.core.database import Base, engine
+from app.core.profiler import ProfilerMiddleware
+from app.core.metrics import CONTENT_TYPE, MetricsMiddleware, render_metrics, run_metrics_flusher
+from app.core.query_stats import QueryStatsMiddleware
+from app.services import hold_service
 
 Base.metadata.create_all(bind=engine)
 
-app = FastAPI(title=settings.app_name)
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    sweeper = asyncio.create_task(hold_service.run_hold_sweeper())
+    metrics_flusher = asyncio.create_task(run_metrics_flusher())
+    yield
+    sweeper.cancel()
+    metrics_flusher.cancel()
+    with suppress(asyncio.CancelledError):
+        # Lets the flusher write this worker's final counts.
+        await metrics_flusher
+
+
+app = FastAPI(title=settings.app_name, lifespan=lifespan)
 
 app.add_middleware(
     CORSMiddleware,
@@ -16,7 +38,12 @@ app.add_middleware(
     allow_credentials=True,
     allow_methods=["*"],
     allow_headers=["*"],
+    expose_headers=["ETag", "X-Next-Cursor", "X-DB-Queries", "X-DB-Time-Ms"],
 )
+app.add_middleware(ProfilerMiddleware)
+# Added before QueryStatsMiddleware so it runs inside it and can read the request's database time.
+app.add_middleware(MetricsMiddleware)
+app.add_middleware(QueryStatsMiddleware)
 
 app.include_router(auth.router, prefix="/api/auth", tags=["auth"])
 app.include_router(users.router, prefix="/api/users", tags=["users"])
@@ -25,9 +52,15 @@ app.include_router(screens.router, prefix="/api/screens", tags=["screens"])
 app.include_router(movies.router, prefix="/api/movies", tags=["movies"])
 app.include_router(shows.router, prefix="/api/shows", tags=["shows"])
 app.include_router(bookings.router, prefix="/api/bookings", tags=["bookings"])
+app.include_router(admin.router, prefix="/api/admin", tags=["admin"])
 
 
 @app.get("/health")
 def health() -> dict[str, str]:
     return {"status": "ok"}
 
+
+
+@app.get("/metrics", include_in_schema=False)
+async def metrics() -> PlainTextResponse:
+    return PlainTextResponse(await run_in_threadpool(render_metrics), media_type=CONTENT_TYPE)